@@ -0,0 +1,60 @@
+# Measure middleware chain depth against in-process latency
+import time
+import asyncio
+from interest import Service, Middleware, Endpoint, http
+from .helpers import Request, parse, report, save
+
+
+# Prepare
+
+DEPTHS = [1, 5, 10, 25, 50]
+SIBLINGS = 10
+NUMBER = 2000
+
+
+def make_service(depth):
+    service = Service()
+    middleware = service
+    respond = asyncio.coroutine(lambda request, **match: http.Response())
+    for level in range(depth):
+        submiddleware = Middleware(service,
+            name='level{level}'.format(level=level),
+            prefix='/level{level}'.format(level=level))
+        middleware.push(submiddleware)
+        middleware = submiddleware
+    for index in range(SIBLINGS):
+        middleware.push(Endpoint(service,
+            name='endpoint{index}'.format(index=index),
+            prefix='/endpoint{index}/<key:int>'.format(index=index),
+            methods=['GET'], respond=respond))
+    return service, middleware[-1].path.replace('<key:int>', '1')
+
+
+@asyncio.coroutine
+def call(service, path, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        yield from service(Request('GET', path))
+    return (time.perf_counter() - start) / number * 1000000
+
+
+def run(*, number):
+    results = []
+    loop = asyncio.get_event_loop()
+    for depth in DEPTHS:
+        service, path = make_service(depth)
+        loop.run_until_complete(call(service, path, 10))
+        results.append({
+            'depth': depth,
+            'siblings': SIBLINGS,
+            'call_us': loop.run_until_complete(call(service, path, number))})
+    return results
+
+
+# Run
+
+if __name__ == '__main__':
+    args = parse('Middleware chain benchmark')
+    results = run(number=NUMBER // 10 if args.quick else NUMBER)
+    report(results)
+    save('chain', results, output=args.output)
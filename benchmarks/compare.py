@@ -0,0 +1,49 @@
+# Compare two saved benchmark results: python -m benchmarks.compare old new
+import json
+import argparse
+
+
+# Prepare
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def split(row):
+    keys = {}
+    values = {}
+    for key, value in row.items():
+        if isinstance(value, float):
+            values[key] = value
+        else:
+            keys[key] = value
+    return tuple(sorted(keys.items())), values
+
+
+def compare(old, new):
+    rows = dict(split(row) for row in old['results'])
+    for row in new['results']:
+        key, values = split(row)
+        if key not in rows:
+            continue
+        columns = ['{key}={value}'.format(key=name, value=value)
+                   for name, value in key]
+        for name, value in sorted(values.items()):
+            base = rows[key].get(name)
+            if not base:
+                continue
+            change = (value - base) / base * 100
+            columns.append('{name}={base:.3f}->{value:.3f} ({change:+.1f}%)'.
+                format(name=name, base=base, value=value, change=change))
+        print(' '.join(columns))
+
+
+# Run
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare benchmark results')
+    parser.add_argument('old', help='Baseline JSON results path')
+    parser.add_argument('new', help='Current JSON results path')
+    args = parser.parse_args()
+    compare(load(args.old), load(args.new))
@@ -0,0 +1,37 @@
+# Compare single alternation regex against per-pattern loop
+import timeit
+from interest.router.parser import StringParser, IntegerParser
+from interest.router.pattern import Pattern, GroupPattern
+
+# Prepare
+SIZES = [5, 25, 100]
+NUMBER = 10000
+PARSERS = {'str': StringParser(None), 'int': IntegerParser(None)}
+
+
+def make_patterns(size):
+    paths = ['/resource{index}/<key:int>'.format(index=index)
+             for index in range(size)]
+    return [Pattern.create(path, PARSERS) for path in paths]
+
+
+def loop(patterns, string):
+    for index, pattern in enumerate(patterns):
+        match = pattern.match(string)
+        if match:
+            return (index, match)
+    return (None, None)
+
+
+# Run
+for size in SIZES:
+    patterns = make_patterns(size)
+    group = GroupPattern(patterns)
+    string = '/resource{index}/100'.format(index=size - 1)
+    assert loop(patterns, string) == group.match(string)
+    tloop = timeit.timeit(lambda: loop(patterns, string), number=NUMBER)
+    tgroup = timeit.timeit(lambda: group.match(string), number=NUMBER)
+    print('size={size} loop={tloop:.3f}s group={tgroup:.3f}s '
+          'speedup={speedup:.1f}x'.format(
+            size=size, tloop=tloop, tgroup=tgroup,
+            speedup=tloop / tgroup))
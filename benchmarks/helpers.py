@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import interest
+
+
+# Module API
+
+RESULTS = os.path.join(os.path.dirname(__file__), 'results')
+
+
+class Request:
+    """Minimal request to call a service in-process.
+    """
+
+    # Public
+
+    def __init__(self, method, path, headers=None):
+        self.method = method
+        self.path = path
+        self.headers = headers or {}
+
+
+def measure(function, *, number, repeat=3):
+    """Return the best time of a function call in microseconds.
+    """
+    timer = timeit.Timer(function)
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1000000
+
+
+def percentile(values, percent):
+    """Return percentile of the values.
+    """
+    values = sorted(values)
+    index = int(round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def parse(description):
+    """Parse common benchmark arguments.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--output', default=None,
+        help='JSON results path (default: benchmarks/results/<name>.json)')
+    parser.add_argument('--quick', action='store_true',
+        help='Run less iterations')
+    return parser.parse_args()
+
+
+def save(name, results, *, output=None):
+    """Save results as JSON to compare runs later.
+    """
+    if output is None:
+        os.makedirs(RESULTS, exist_ok=True)
+        output = os.path.join(RESULTS, name + '.json')
+    data = {
+        'name': name,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'interest': interest.version,
+        'results': results}
+    with open(output, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+    print('Saved to {output}'.format(output=output), file=sys.stderr)
+
+
+def report(results):
+    """Print results as table rows.
+    """
+    for row in results:
+        print(' '.join(
+            '{key}={value}'.format(
+                key=key,
+                value=round(value, 3) if isinstance(value, float) else value)
+            for key, value in sorted(row.items())))
@@ -0,0 +1,78 @@
+# Benchmark requests per second and latency over the loopback interface
+# against the examples/advanced.py service
+import os
+import time
+import socket
+import asyncio
+import aiohttp
+from interest import Tester
+from .helpers import parse, percentile, report, save
+
+
+# Prepare
+
+PATHS = ['/api/v1/comment/key=1']
+CONCURRENCY = [1, 10, 50]
+REQUESTS = 2000
+BASEDIR = os.path.join(os.path.dirname(__file__), '..')
+EXAMPLE = os.path.join(BASEDIR, 'examples', 'advanced.py')
+
+
+def get_port():
+    sock = socket.socket()
+    sock.bind(('', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+@asyncio.coroutine
+def client(url, connector, latencies, count, *, loop):
+    for _ in range(count):
+        start = loop.time()
+        response = yield from aiohttp.request(
+            'GET', url, connector=connector, loop=loop)
+        yield from response.read()
+        latencies.append(loop.time() - start)
+
+
+def run(*, requests):
+    results = []
+    port = get_port()
+    tester = Tester(EXAMPLE, port=port,
+        environ={'PYTHONPATH': os.path.abspath(BASEDIR)})
+    tester.start()
+    loop = asyncio.get_event_loop()
+    try:
+        for path in PATHS:
+            url = 'http://{host}:{port}{path}'.format(
+                host=Tester.HOST, port=port, path=path)
+            for concurrency in CONCURRENCY:
+                latencies = []
+                connector = aiohttp.TCPConnector(loop=loop)
+                count = requests // concurrency
+                clients = [
+                    client(url, connector, latencies, count, loop=loop)
+                    for _ in range(concurrency)]
+                start = time.perf_counter()
+                loop.run_until_complete(asyncio.wait(clients, loop=loop))
+                elapsed = time.perf_counter() - start
+                connector.close()
+                results.append({
+                    'path': path,
+                    'concurrency': concurrency,
+                    'rps': len(latencies) / elapsed,
+                    'p50_ms': percentile(latencies, 50) * 1000,
+                    'p99_ms': percentile(latencies, 99) * 1000})
+    finally:
+        tester.stop()
+    return results
+
+
+# Run
+
+if __name__ == '__main__':
+    args = parse('Loopback benchmark')
+    results = run(requests=REQUESTS // 10 if args.quick else REQUESTS)
+    report(results)
+    save('loopback', results, output=args.output)
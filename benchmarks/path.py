@@ -0,0 +1,40 @@
+# Compare cached Middleware.path against recursive computation
+import timeit
+from interest import Service, Middleware
+
+# Prepare
+DEPTHS = [1, 10, 50]
+NUMBER = 100000
+
+
+def make_service(depth):
+    service = Service(prefix='/api')
+    middleware = service
+    for level in range(depth):
+        submiddleware = Middleware(service,
+            name='level{level}'.format(level=level),
+            prefix='/level{level}'.format(level=level))
+        middleware.push(submiddleware)
+        middleware = submiddleware
+    return middleware
+
+
+def recursive_path(middleware):
+    # Path computation before caching
+    path = middleware._Middleware__prefix
+    if middleware is not middleware.over:
+        path = recursive_path(middleware.over) + path
+    return path
+
+
+# Run
+for depth in DEPTHS:
+    middleware = make_service(depth)
+    assert middleware.path == recursive_path(middleware)
+    tcached = timeit.timeit(lambda: middleware.path, number=NUMBER)
+    trecursive = timeit.timeit(
+        lambda: recursive_path(middleware), number=NUMBER)
+    print('depth={depth} recursive={trecursive:.3f}s cached={tcached:.3f}s '
+          'speedup={speedup:.1f}x'.format(
+            depth=depth, trecursive=trecursive, tcached=tcached,
+            speedup=trecursive / tcached))
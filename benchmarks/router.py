@@ -0,0 +1,58 @@
+# Micro-benchmark Router.match/Router.url/Pattern.create on route tables
+from interest import Service, Endpoint, http
+from interest.router.parser import StringParser, IntegerParser
+from interest.router.pattern import Pattern
+from .helpers import Request, measure, parse, report, save
+
+
+# Prepare
+
+SIZES = [10, 100, 1000, 5000]
+NUMBER = 2000
+
+
+def make_service(size):
+    service = Service()
+    respond = lambda request, **match: http.Response()
+    for index in range(size):
+        prefix = '/resource{index}'.format(index=index)
+        if index % 2:
+            prefix += '/<key:int>'
+        service.push(Endpoint(service,
+            name='resource{index}'.format(index=index),
+            prefix=prefix, methods=['GET'], respond=respond))
+    return service
+
+
+def run(*, number):
+    results = []
+    parsers = {'str': StringParser(None), 'int': IntegerParser(None)}
+    for size in SIZES:
+        service = make_service(size)
+        last = service[size - 1]
+        path = last.path.replace('<key:int>', '1')
+        service.match(Request('GET', path), path=last.path)
+        results.append({
+            'size': size,
+            'match_us': measure(
+                lambda: service.match(Request('GET', path), path=last.path),
+                number=number),
+            'match_miss_us': measure(
+                lambda: service.match(Request('GET', '/miss'), path=last.path),
+                number=number),
+            'url_us': measure(
+                lambda: service.url(last.name, key=1),
+                number=number),
+            'create_us': measure(
+                lambda: Pattern.create(last.path, parsers),
+                number=number)})
+    return results
+
+
+# Run
+
+if __name__ == '__main__':
+    args = parse('Router benchmark')
+    results = run(number=NUMBER // 10 if args.quick else NUMBER)
+    report(results)
+    save('router', results, output=args.output)
@@ -0,0 +1,59 @@
+# Benchmark import time of the package in fresh interpreters
+import sys
+import subprocess
+from .helpers import parse, percentile, report, save
+
+
+# Prepare
+
+STATEMENTS = {
+    'package': 'import interest',
+    'router': 'import interest; interest.Router',
+    'service': 'from interest import Service, Middleware, http'}
+BUDGETS = {
+    # Package is imported eagerly before Python 3.7 (no PEP 562)
+    'package': 5 if sys.version_info >= (3, 7) else 300,
+    'router': 100,
+    'service': 300}
+REPEAT = 20
+
+
+def measure_import(statement):
+    # Interpreter reports its own time to exclude process spawning
+    code = (
+        'import time; start = time.perf_counter(); {statement}; '
+        'print(time.perf_counter() - start)'.format(statement=statement))
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return float(output) * 1000
+
+
+def run(*, repeat):
+    results = []
+    for name, statement in sorted(STATEMENTS.items()):
+        times = [measure_import(statement) for _ in range(repeat)]
+        results.append({
+            'name': name,
+            'median_ms': percentile(times, 50),
+            'p90_ms': percentile(times, 90),
+            'budget_ms': float(BUDGETS[name])})
+    return results
+
+
+def check(results):
+    failed = [row['name'] for row in results
+              if row['median_ms'] > row['budget_ms']]
+    if failed:
+        print('Import time budget exceeded: {names}'.
+            format(names=', '.join(failed)), file=sys.stderr)
+    return not failed
+
+
+# Run
+
+if __name__ == '__main__':
+    args = parse('Startup benchmark')
+    results = run(repeat=REPEAT // 4 if args.quick else REPEAT)
+    report(results)
+    save('startup', results, output=args.output)
+    if not check(results):
+        sys.exit(1)
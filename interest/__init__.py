@@ -1,12 +1,65 @@
-from .adapter import Adapter
-from .backend import http
-from .endpoint import Endpoint
-from .handler import Handler, Record
-from .helpers import Chain, Config, Match
-from .logger import Logger
-from .middleware import Middleware
-from .provider import Provider
-from .router import Router, Parser
-from .service import Service
-from .tester import Tester
+import sys
+from importlib import import_module
 version = '0.4.1'  # REPLACE: version = '{{ version }}'
+
+# Public attributes are imported from submodules on the first access
+# so tools using only a part of the package don't import aiohttp etc.
+__all__ = [
+    'Adapter',
+    'http',
+    'Endpoint',
+    'Executor',
+    'Handler',
+    'Record',
+    'Chain',
+    'Config',
+    'Match',
+    'Logger',
+    'Metrics',
+    'Middleware',
+    'Provider',
+    'Router',
+    'Parser',
+    'Service',
+    'Supervisor',
+    'Tester']
+_MODULES = {
+    'Adapter': 'adapter',
+    'http': 'backend',
+    'Endpoint': 'endpoint',
+    'Executor': 'executor',
+    'Handler': 'handler',
+    'Record': 'handler',
+    'Chain': 'helpers',
+    'Config': 'helpers',
+    'Match': 'helpers',
+    'Logger': 'logger',
+    'Metrics': 'metrics',
+    'Middleware': 'middleware',
+    'Provider': 'provider',
+    'Router': 'router',
+    'Parser': 'router',
+    'Service': 'service',
+    'Supervisor': 'supervisor',
+    'Tester': 'tester'}
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(
+            'module {module!r} has no attribute {name!r}'.
+            format(module=__name__, name=name))
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# Module __getattr__ is supported since Python 3.7 (PEP 562)
+if sys.version_info < (3, 7):
+    for name in __all__:
+        __getattr__(name)
@@ -141,6 +141,10 @@ class http:
     ExpectationFailed = web.HTTPExpectationFailed
     """417 Expectation Failed.
     """
+    TooManyRequests = getattr(web, 'HTTPTooManyRequests', None) or type(
+        'HTTPTooManyRequests', (web.HTTPClientError,), {'status_code': 429})
+    """429 Too Many Requests.
+    """
     ServerError = web.HTTPServerError
     """5xx Server Error.
     """
@@ -176,6 +180,8 @@ class http:
             return function
         if isinstance(param, str):
             return partial(stick, prefix=param, **kwargs)
+        if param is None:
+            return partial(stick, **kwargs)
         return stick(param, **kwargs)
 
     @classmethod
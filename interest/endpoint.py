@@ -1,5 +1,8 @@
+import types
 import asyncio
+import inspect
 from .backend import http
+from .helpers import Limiter, wait
 from .middleware import Middleware
 
 
@@ -20,7 +23,18 @@ class Endpoint(Middleware):
     respond: coroutine
         Coroutine to respond to a request.
     extra: dict
-        Extra arguments.
+        Extra arguments. The max_requests extra argument limits
+        the endpoint's in-flight requests. Requests beyond the limit
+        get :class:`.http.ServiceUnavailable`. The deadline extra argument
+        limits processing time in seconds (request.deadline is updated).
+        Processing is cancelled on the deadline and
+        :class:`.http.GatewayTimeout` is raised. The offload='thread'
+        extra argument runs a synchronous respond function
+        in the :class:`.Executor`. The offload='process' extra argument
+        runs a static method or a module-level function in the executor's
+        process pool. It's called with the request's body (bytes)
+        instead of the request and bytes or str result is wrapped
+        to :class:`.http.Response`.
 
     Examples
     --------
@@ -56,17 +70,69 @@ class Endpoint(Middleware):
         if respond is not None:
             self.respond = respond
         self.__extra = extra
+        self.__allow = frozenset(map(str.upper, self.methods))
+        self.__limiter = None
+        if extra.get('max_requests') is not None:
+            self.__limiter = Limiter(extra['max_requests'])
+        self.__deadline = extra.get('deadline')
+        self.__offload = extra.get('offload')
+        self.__function = None
+        if self.__offload is not None:
+            self.__function = self.__get_function(self.respond)
+            self.service.executor.require(self.__offload)
 
     @asyncio.coroutine
     def __call__(self, request):
         match = self.service.match(request, path=self.path)
         if match:
-            lmatch = self.service.match(request, methods=self.methods)
-            if not lmatch:
-                raise http.MethodNotAllowed(request.method, self.methods)
-            if self.respond is not None:
-                return (yield from self.respond(request, **match))
-            return (yield from self.process(request))
+            if self.__allow and request.method not in self.__allow:
+                # Stacked bindings on the same path
+                table = self.service.dispatch(
+                    request, over=self.over, path=self.path)
+                allow = self.__allow
+                if table is not None:
+                    endpoint = table.lookup(request.method, after=self)
+                    if endpoint is not None:
+                        return (yield from self.next(request))
+                    allow = table.allow
+                raise http.MethodNotAllowed(request.method, allow)
+            limiter = self.__limiter
+            if limiter is not None:
+                admitted = yield from limiter.acquire(loop=self.service.loop)
+                if not admitted:
+                    raise http.ServiceUnavailable()
+            metrics = self.service.metrics
+            start = metrics.begin(self)
+            status = 500
+            try:
+                if self.__offload == 'process':
+                    coroutine = self.__offload_process(request, match)
+                elif self.__function is not None:
+                    coroutine = self.service.offload(self.__function,
+                        (request,), match, kind=self.__offload)
+                elif self.respond is not None:
+                    coroutine = self.respond(request, **match)
+                else:
+                    coroutine = self.process(request)
+                if metrics.profile:
+                    coroutine = metrics.measure(self, request, coroutine)
+                if self.__deadline is not None:
+                    coroutine = self.__limit_time(request, coroutine)
+                response = yield from coroutine
+                status = getattr(response, 'status', 200)
+            except http.Exception as exception:
+                status = exception.status
+                raise
+            except asyncio.TimeoutError:
+                if self.__deadline is None:
+                    raise
+                status = 504
+                raise http.GatewayTimeout()
+            finally:
+                metrics.end(self, start, status)
+                if limiter is not None:
+                    limiter.release()
+            return response
         return (yield from self.next(request))
 
     def __repr__(self):
@@ -99,3 +165,44 @@ class Endpoint(Middleware):
             Reply value.
         """
         raise http.NotFound()
+
+    # Private
+
+    def __get_function(self, respond):
+        # http.bind wraps plain functions by asyncio.coroutine
+        function = getattr(respond, '__func__', respond)
+        function = getattr(function, '__wrapped__', function)
+        if (function is None or asyncio.iscoroutinefunction(function) or
+                inspect.isgeneratorfunction(function)):
+            raise ValueError(
+                'Offloaded endpoint requires a synchronous function')
+        owner = getattr(respond, '__self__', None)
+        if self.__offload == 'process':
+            # Function is sent to the worker process by reference
+            if owner is not None or '<locals>' in function.__qualname__:
+                raise ValueError(
+                    'Process offloaded endpoint requires a static method '
+                    'or a module-level function')
+        elif owner is not None:
+            function = types.MethodType(function, owner)
+        return function
+
+    @asyncio.coroutine
+    def __offload_process(self, request, match):
+        body = yield from request.read()
+        response = yield from self.service.offload(
+            self.__function, (body,), match, kind='process')
+        if isinstance(response, bytes):
+            response = http.Response(body=response)
+        elif isinstance(response, str):
+            response = http.Response(text=response)
+        return response
+
+    def __limit_time(self, request, coroutine):
+        now = self.service.loop.time()
+        deadline = now + self.__deadline
+        current = getattr(request, 'deadline', None)
+        if current is not None:
+            deadline = min(deadline, current)
+        request.deadline = deadline
+        return wait(coroutine, loop=self.service.loop, timeout=deadline - now)
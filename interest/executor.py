@@ -0,0 +1,310 @@
+import os
+import mmap
+import asyncio
+import inspect
+import importlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from .helpers import Config
+
+
+class Executor(Config):
+    """Executor is a component responsible for the offloaded calls.
+
+    Executor runs synchronous functions in the bounded thread pool
+    so blocking code doesn't stall the loop ('thread' kind) or
+    in the process pool so CPU-bound code runs in parallel ('process'
+    kind). Pools are created on the first call in every process.
+    The process pool required by endpoints is started
+    by :meth:`.Executor.start` when the service starts listening.
+    Executor counts pending (queued or running) calls of every kind
+    for metrics.
+
+    Process calls send the function by reference (module and qualified
+    name) so it must be a module-level function or a static method.
+    Arguments and results must be picklable. Large bytes results
+    are passed back through a memory-mapped file in the shared memory
+    directory instead of the result pipe (the file is removed
+    even if the awaiting call is cancelled).
+
+    .. seealso:: Implements:
+        :class:`.Config`
+
+    Parameters
+    ----------
+    service: :class:`.Service`
+        Service instance.
+    threads: int
+        Maximum number of worker threads.
+    processes: int
+        Number of worker processes (None for the number of CPUs).
+    shared_length: int
+        Minimal length of a bytes result to pass through shared memory.
+
+    Examples
+    --------
+    Usually executor is used by endpoints bound with offload parameter::
+
+        class Middleware(Middleware):
+
+            # Public
+
+            @http.get('/report', offload='thread')
+            def report(self, request):
+                return http.Response(text=legacy_blocking_report())
+
+            @staticmethod
+            @http.post('/resize/<size:int>', offload='process')
+            def resize(body, size):
+                return resize_image(body, size)
+
+        service = Service(executor=Executor.config(threads=20, processes=4))
+    """
+
+    # Public
+
+    THREADS = 10
+    """Default threads parameter.
+    """
+    PROCESSES = None
+    """Default processes parameter.
+    """
+    SHARED_LENGTH = 1024 * 1024
+    """Default shared_length parameter.
+    """
+
+    def __init__(self, service, *,
+                 threads=None, processes=None, shared_length=None):
+        if threads is None:
+            threads = self.THREADS
+        if processes is None:
+            processes = self.PROCESSES
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if shared_length is None:
+            shared_length = self.SHARED_LENGTH
+        self.__service = service
+        self.__sizes = {'thread': threads, 'process': processes}
+        self.__shared_length = shared_length
+        self.__pools = {}
+        self.__pid = None
+        self.__required = set()
+        self.__pending = {'thread': 0, 'process': 0}
+
+    @property
+    def service(self):
+        """:class:`.Service` instance (read-only).
+        """
+        return self.__service
+
+    @property
+    def threads(self):
+        """Maximum number of worker threads (read-only).
+        """
+        return self.__sizes['thread']
+
+    @property
+    def processes(self):
+        """Number of worker processes (read-only).
+        """
+        return self.__sizes['process']
+
+    def size(self, kind='thread'):
+        """Return number of workers of the kind.
+        """
+        return self.__sizes[kind]
+
+    def pending(self, kind='thread'):
+        """Return number of queued or running calls of the kind.
+        """
+        return self.__pending[kind]
+
+    def queued(self, kind='thread'):
+        """Return number of calls of the kind waiting for a worker.
+        """
+        return max(0, self.__pending[kind] - self.size(kind))
+
+    def require(self, kind):
+        """Mark the pool of the kind as required by an endpoint.
+        """
+        if kind not in self.__sizes:
+            raise ValueError(
+                'Unsupported executor kind "{kind}"'.format(kind=kind))
+        self.__required.add(kind)
+
+    def start(self):
+        """Start the required process pool's workers.
+
+        It's called by :meth:`.Service.listen` (in every worker)
+        so worker processes are forked before the first request.
+        """
+        if 'process' in self.__required:
+            pool = self.__get_pool('process')
+            pool.submit(os.getpid)
+
+    @asyncio.coroutine
+    def run(self, function, args=(), kwargs=None, *, kind='thread'):
+        """Run a synchronous function off the loop (coroutine).
+
+        Arguments are passed as a list and a dict (not unpacked)
+        so they can't collide with run's own parameters.
+
+        Parameters
+        ----------
+        function: callable
+            Function to call.
+        args: list
+            Positional arguments.
+        kwargs: dict
+            Keyword arguments.
+        kind: str
+            Executor kind: 'thread' or 'process'.
+
+        Returns
+        -------
+        object
+            Function's result.
+        """
+        if kind not in self.__sizes:
+            raise ValueError(
+                'Unsupported executor kind "{kind}"'.format(kind=kind))
+        if kwargs is None:
+            kwargs = {}
+        pool = self.__get_pool(kind)
+        if kind == 'process':
+            call = partial(invoke, reference(function),
+                tuple(args), kwargs, self.__shared_length)
+        else:
+            call = partial(function, *args, **kwargs)
+        self.__pending[kind] += 1
+        future = pool.submit(call)
+        try:
+            result = yield from asyncio.wrap_future(
+                future, loop=self.service.loop)
+        except asyncio.CancelledError:
+            # Nobody is going to read the result
+            future.add_done_callback(release)
+            raise
+        finally:
+            self.__pending[kind] -= 1
+        if isinstance(result, Segment):
+            result = result.read()
+        return result
+
+    @asyncio.coroutine
+    def close(self):
+        """Shutdown the pools after running calls (coroutine).
+
+        Pools are shut down in the loop's default executor
+        so waiting for the workers doesn't block the loop.
+        """
+        pools = []
+        if self.__pid == os.getpid():
+            pools = list(self.__pools.values())
+        self.__pools = {}
+        for pool in pools:
+            # Not waiting process pool hangs on exit (Python 3.7/3.8)
+            yield from self.service.loop.run_in_executor(
+                None, partial(pool.shutdown, wait=True))
+
+    # Private
+
+    def __get_pool(self, kind):
+        # Pools don't survive fork so workers create own pools
+        if self.__pid != os.getpid():
+            self.__pools = {}
+            self.__pid = os.getpid()
+        pool = self.__pools.get(kind)
+        if pool is None:
+            factory = ThreadPoolExecutor
+            if kind == 'process':
+                # Multiprocessing is slow to import and rarely used
+                from concurrent.futures import ProcessPoolExecutor
+                factory = ProcessPoolExecutor
+            pool = factory(max_workers=self.__sizes[kind])
+            self.__pools[kind] = pool
+        return pool
+
+
+class Segment:
+    """Shared memory segment with a process call's result.
+    """
+
+    # Public
+
+    DIRECTORY = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+    def __init__(self, path, length):
+        self.path = path
+        self.length = length
+
+    def __repr__(self):
+        template = '<Segment path="{self.path}" length={self.length}>'
+        compiled = template.format(self=self)
+        return compiled
+
+    @classmethod
+    def write(cls, data):
+        # Used in worker processes only
+        import tempfile
+        descriptor, path = tempfile.mkstemp(
+            prefix='interest-', dir=cls.DIRECTORY)
+        try:
+            os.ftruncate(descriptor, len(data))
+            with mmap.mmap(descriptor, len(data)) as memory:
+                memory[:] = data
+        finally:
+            os.close(descriptor)
+        return cls(path, len(data))
+
+    def read(self):
+        try:
+            with open(self.path, 'rb') as file:
+                with mmap.mmap(
+                        file.fileno(), self.length,
+                        access=mmap.ACCESS_READ) as memory:
+                    return memory[:]
+        finally:
+            self.release()
+
+    def release(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def reference(function):
+    """Return a picklable reference to a function.
+    """
+    function = inspect.unwrap(function)
+    qualname = function.__qualname__
+    if '<locals>' in qualname:
+        raise ValueError(
+            'Process offloaded function "{qualname}" is not reachable '
+            'from its module'.format(qualname=qualname))
+    return (function.__module__, qualname)
+
+
+def release(future):
+    """Remove the shared memory segment of a not awaited call's result.
+    """
+    if future.cancelled() or future.exception() is not None:
+        return
+    result = future.result()
+    if isinstance(result, Segment):
+        result.release()
+
+
+def invoke(reference, args, kwargs, shared_length):
+    """Resolve the function's reference and call it in a worker process.
+    """
+    module, qualname = reference
+    function = importlib.import_module(module)
+    for name in qualname.split('.'):
+        function = vars(function)[name]
+    function = inspect.unwrap(getattr(function, '__func__', function))
+    result = function(*args, **kwargs)
+    if isinstance(result, bytes) and len(result) >= shared_length:
+        result = Segment.write(result)
+    return result
@@ -2,7 +2,7 @@ import asyncio
 import traceback
 from aiohttp.server import ServerHttpProtocol
 from ..backend import http
-from ..helpers import Config
+from ..helpers import Config, Limiter, wait
 from .record import Record
 
 
@@ -24,6 +24,26 @@ class Handler(Config, ServerHttpProtocol):
         Time to keep connection opened in seconds.
     request_timeout: int
         Slow request timeout in seconds.
+    shutdown_timeout: int
+        Time to wait for in-flight requests on shutdown in seconds.
+    max_requests: int
+        Maximum number of in-flight requests (None for unlimited).
+        Requests beyond the limit wait in the queue and get
+        :class:`.http.ServiceUnavailable` if the queue is full or
+        the queue timeout is exceeded.
+    queue_size: int
+        Maximum number of requests waiting for admission.
+    queue_timeout: float
+        Time to wait for admission in seconds.
+    target_latency: float
+        Target request latency in seconds. If it's set max_requests
+        is adapted to keep latency under the target (AIMD).
+    deadline: float
+        Time to process a request in seconds (None for unlimited).
+        Processing is cancelled on the deadline and
+        :class:`.http.GatewayTimeout` is returned. Absolute deadline
+        in the loop's time is available as request.deadline.
+        Processing is also cancelled if the client disconnects.
 
     Example
     -------
@@ -37,6 +57,11 @@ class Handler(Config, ServerHttpProtocol):
         loop = asyncio.get_event_loop()
         server = loop.create_server(handler.fork)
         server = self.loop.run_until_complete(server)
+
+    To shed load let's admit up to 100 requests with 50 more waiting::
+
+        handler = Handler(
+            '<service>', max_requests=100, queue_size=50, queue_timeout=1)
     """
 
     # Public
@@ -47,6 +72,24 @@ class Handler(Config, ServerHttpProtocol):
     REQUEST_TIMEOUT = 15
     """Slow request timeout in seconds (default).
     """
+    SHUTDOWN_TIMEOUT = 15
+    """Time to wait for in-flight requests on shutdown in seconds (default).
+    """
+    MAX_REQUESTS = None
+    """Maximum number of in-flight requests (default).
+    """
+    QUEUE_SIZE = 0
+    """Maximum number of requests waiting for admission (default).
+    """
+    QUEUE_TIMEOUT = 1
+    """Time to wait for admission in seconds (default).
+    """
+    TARGET_LATENCY = None
+    """Target request latency in seconds (default).
+    """
+    DEADLINE = None
+    """Time to process a request in seconds (default).
+    """
 
     def __new__(cls, *args, **kwargs):
         self = object.__new__(cls)
@@ -55,16 +98,44 @@ class Handler(Config, ServerHttpProtocol):
         return self
 
     def __init__(self, service, *,
-                 connection_timeout=None, request_timeout=None):
+                 connection_timeout=None, request_timeout=None,
+                 shutdown_timeout=None, max_requests=None,
+                 queue_size=None, queue_timeout=None, target_latency=None,
+                 deadline=None):
         if connection_timeout is None:
             connection_timeout = self.CONNECTION_TIMEOUT
         if request_timeout is None:
             request_timeout = self.REQUEST_TIMEOUT
+        if shutdown_timeout is None:
+            shutdown_timeout = self.SHUTDOWN_TIMEOUT
+        if max_requests is None:
+            max_requests = self.MAX_REQUESTS
+        if queue_size is None:
+            queue_size = self.QUEUE_SIZE
+        if queue_timeout is None:
+            queue_timeout = self.QUEUE_TIMEOUT
+        if target_latency is None:
+            target_latency = self.TARGET_LATENCY
+        if deadline is None:
+            deadline = self.DEADLINE
         super().__init__(
             loop=service.loop,
             keep_alive=connection_timeout,
             timeout=request_timeout)
         self.__service = service
+        self.__shutdown_timeout = shutdown_timeout
+        self.__deadline = deadline
+        self.__task = None
+        # Registry shared by all forks
+        self.__origin = self
+        self.__connections = set()
+        self.__requests = set()
+        self.__closing = False
+        self.__limiter = None
+        if max_requests is not None:
+            self.__limiter = Limiter(max_requests,
+                queue_size=queue_size, queue_timeout=queue_timeout,
+                latency=target_latency)
 
     @property
     def service(self):
@@ -72,37 +143,82 @@ class Handler(Config, ServerHttpProtocol):
         """
         return self.__service
 
+    @property
+    def limiter(self):
+        """:class:`.Limiter` of in-flight requests or None (read-only).
+        """
+        return self.__origin.__limiter
+
     def fork(self):
         """Handler factory for asyncio's loop.create_server.
         """
-        return type(self)(*self.__args, **self.__kwargs)
+        handler = type(self)(*self.__args, **self.__kwargs)
+        handler.__origin = self.__origin
+        return handler
+
+    @asyncio.coroutine
+    def shutdown(self, *, timeout=None):
+        """Shutdown forked handlers gracefully (coroutine).
+
+        Idle keep-alive connections are closed immediately.
+        Connections handling requests are closed after the response
+        or aborted if the timeout is exceeded.
+
+        Parameters
+        ----------
+        timeout: int
+            Time to wait for in-flight requests in seconds.
+
+        Returns
+        -------
+        tuple
+            Numbers of drained and aborted requests.
+        """
+        if timeout is None:
+            timeout = self.__shutdown_timeout
+        origin = self.__origin
+        origin.__closing = True
+        requests = set(origin.__requests)
+        for connection in list(origin.__connections):
+            if connection not in requests:
+                connection.__close()
+        deadline = self.service.loop.time() + timeout
+        while (origin.__requests & requests and
+               self.service.loop.time() < deadline):
+            yield from asyncio.sleep(
+                self.__SHUTDOWN_INTERVAL, loop=self.service.loop)
+        aborted = origin.__requests & requests
+        for connection in aborted:
+            connection.__close()
+        return (len(requests) - len(aborted), len(aborted))
 
     # Internal (aiohttp.server.ServerHttpProtocol's hooks)
 
+    def connection_made(self, transport):
+        super().connection_made(transport)
+        self.__origin.__connections.add(self)
+
+    def connection_lost(self, exc):
+        super().connection_lost(exc)
+        if self.__task is not None:
+            self.__task.cancel()
+        self.__origin.__connections.discard(self)
+        self.__origin.__requests.discard(self)
+
     @asyncio.coroutine
     def handle_request(self, message, payload):
-        start_time = self.service.loop.time()
-        request = http.Request(
-            None, message, payload,
-            self.transport, self.reader, self.writer)
+        self.__origin.__requests.add(self)
         try:
-            response = yield from self.service(request)
-        except http.Exception as exception:
-            response = exception
-        if not isinstance(response, http.StreamResponse):
-            raise RuntimeError('Service returned not a StreamResponse')
-        resp_msg = response.start(request)
-        yield from response.write_eof()
-        self.keep_alive(resp_msg.keep_alive())
-        stop_time = self.service.loop.time()
-        self.log_access(message, None, resp_msg, stop_time - start_time)
+            yield from self.__handle_request(message, payload)
+        finally:
+            self.__origin.__requests.discard(self)
 
     def log_access(self, message, environ, response, time):
         try:
             record = Record(
                 request=message, response=response,
                 transport=self.transport, duration=time)
-            self.service.log('access', record)
+            return self.service.log('access', record)
         except:
             self.service.log('error', traceback.format_exc())
 
@@ -111,3 +227,55 @@ class Handler(Config, ServerHttpProtocol):
 
     def log_exception(self, message, *args, **kwargs):
         self.service.log('exception', message, *args, **kwargs)
+
+    # Private
+
+    __SHUTDOWN_INTERVAL = 0.1
+
+    @asyncio.coroutine
+    def __handle_request(self, message, payload):
+        start_time = self.service.loop.time()
+        request = http.Request(
+            None, message, payload,
+            self.transport, self.reader, self.writer)
+        limiter = self.__origin.__limiter
+        admitted = True
+        if limiter is not None:
+            admitted = yield from limiter.acquire(loop=self.service.loop)
+        admit_time = self.service.loop.time()
+        timeout = None
+        request.deadline = None
+        if self.__deadline is not None:
+            request.deadline = start_time + self.__deadline
+            timeout = request.deadline - admit_time
+        try:
+            if not admitted:
+                raise http.ServiceUnavailable()
+            self.__task = self.service.loop.create_task(
+                self.service(request))
+            response = yield from wait(
+                self.__task, loop=self.service.loop, timeout=timeout)
+        except http.Exception as exception:
+            response = exception
+        except asyncio.TimeoutError:
+            response = http.GatewayTimeout()
+        finally:
+            self.__task = None
+            if limiter is not None and admitted:
+                limiter.release(self.service.loop.time() - admit_time)
+        if not isinstance(response, http.StreamResponse):
+            raise RuntimeError('Service returned not a StreamResponse')
+        resp_msg = response.start(request)
+        yield from response.write_eof()
+        keep_alive = resp_msg.keep_alive() and not self.__origin.__closing
+        self.keep_alive(keep_alive)
+        stop_time = self.service.loop.time()
+        waiter = self.log_access(
+            message, None, resp_msg, stop_time - start_time)
+        if waiter is not None:
+            # Access log backpressure
+            yield from waiter
+
+    def __close(self):
+        if self.transport is not None:
+            self.transport.close()
@@ -1,4 +1,6 @@
-from aiohttp.helpers import atoms
+import os
+import time
+from email.utils import formatdate
 
 
 class Record(dict):
@@ -7,6 +9,8 @@ class Record(dict):
     Record object represents interaction between :class:`.Handler`
     and client as dict ready to use with text templates. Dict is safe.
     If key is missing client gets '-' symbol. All values are strings.
+    Items are lazy: an item is computed on the first access
+    and cached, so a template pays only for the items it uses.
     See available items below.
 
     .. seealso:: Implements:
@@ -24,8 +28,8 @@ class Record(dict):
         Handling duration in mileseconds.
     host: str
         Client remote adress.
-    lenght: str
-        Response length in bytes.
+    length: str
+        Response length in bytes (also available as lenght).
     process: str
         Process identifier.
     referer: str
@@ -36,6 +40,8 @@ class Record(dict):
         Response status.
     time: str
         Time when handling have been done (GMT).
+    timing: str
+        Server-Timing header (see :class:`.Metrics` profiling mode).
     <key:req>: str
         Request's header by key.
     <key:res>: str
@@ -61,6 +67,11 @@ class Record(dict):
 
     # Public
 
+    __slots__ = (
+        '__reqheads', '__resheads',
+        '__request', '__response', '__transport',
+        '__duration', '__timestamp')
+
     def __init__(self, *, request, response, transport, duration):
         self.__reqheads = getattr(request, 'headers', None)
         self.__resheads = getattr(response, 'headers', None)
@@ -68,7 +79,7 @@ class Record(dict):
         self.__response = response
         self.__transport = transport
         self.__duration = duration
-        self.__add_values()
+        self.__timestamp = time.time()
 
     def __missing__(self, key):
         default = '-'
@@ -79,21 +90,66 @@ class Record(dict):
             elif key.endswith(':res>'):
                 headers = self.__resheads
             if headers is not None:
-                return headers.get(key[1:-5], default)
-        return default
+                value = headers.get(key[1:-5], default)
+                self[key] = value
+                return value
+            return default
+        getter = self.__GETTERS.get(key)
+        if getter is None:
+            return default
+        try:
+            value = getter(self)
+        except Exception:
+            value = default
+        self[key] = value
+        return value
 
     # Private
 
-    def __add_values(self):
-        data = atoms(
-            self.__request, None, self.__response,
-            self.__transport, self.__duration)
-        self['agent'] = data.get('a', '-')
-        self['duration'] = data.get('D', '-')
-        self['host'] = data.get('h', '-')
-        self['lenght'] = data.get('b', '-')
-        self['process'] = data.get('p', '-')
-        self['referer'] = data.get('f', '-')
-        self['request'] = data.get('r', '-')
-        self['status'] = data.get('s', '-')
-        self['time'] = data.get('t', '-')
+    def __get_agent(self):
+        return self.__reqheads.get('USER-AGENT', '-')
+
+    def __get_duration(self):
+        return str(int(self.__duration * 1000))
+
+    def __get_host(self):
+        peername = self.__transport.get_extra_info('peername')
+        if isinstance(peername, (list, tuple)):
+            return str(peername[0])
+        return '-'
+
+    def __get_length(self):
+        return str(self.__response.output_length)
+
+    def __get_process(self):
+        return '<{pid}>'.format(pid=os.getpid())
+
+    def __get_referer(self):
+        return self.__reqheads.get('REFERER', '-')
+
+    def __get_request(self):
+        return '{request.method} {request.path} HTTP/{version}'.format(
+            request=self.__request,
+            version='.'.join(map(str, self.__request.version)))
+
+    def __get_status(self):
+        return str(self.__response.status)
+
+    def __get_time(self):
+        return formatdate(self.__timestamp, usegmt=True)
+
+    def __get_timing(self):
+        return self.__resheads.get('SERVER-TIMING', '-')
+
+    __GETTERS = {
+        'agent': __get_agent,
+        'duration': __get_duration,
+        'host': __get_host,
+        'length': __get_length,
+        'lenght': __get_length,
+        'process': __get_process,
+        'referer': __get_referer,
+        'request': __get_request,
+        'status': __get_status,
+        'time': __get_time,
+        'timing': __get_timing}
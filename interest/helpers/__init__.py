@@ -1,5 +1,7 @@
+from .cache import Cache
 from .chain import Chain
 from .config import Config
+from .limiter import Limiter
 from .loop import loop
 from .match import Match
 from .name import name
@@ -8,3 +10,4 @@ from .plugin import PluginImporter
 from .port import port
 from .python import python
 from .sticker import STICKER
+from .wait import wait
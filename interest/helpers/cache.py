@@ -0,0 +1,89 @@
+from collections import OrderedDict
+
+
+class Cache:
+    """Cache is a bounded mapping with LRU eviction.
+
+    Cache counts hits and misses of :meth:`.Cache.get` calls
+    and evictions of the least recently used items.
+
+    Parameters
+    ----------
+    size: int
+        Maximum number of items (None for unbounded).
+    """
+
+    # Public
+
+    def __init__(self, size=None):
+        self.__size = size
+        self.__items = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __repr__(self):
+        template = (
+            '<Cache size="{self.size}" length="{length}" '
+            'hits="{self.hits}" misses="{self.misses}" '
+            'evictions="{self.evictions}">')
+        compiled = template.format(self=self, length=len(self))
+        return compiled
+
+    def __contains__(self, key):
+        return key in self.__items
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __setitem__(self, key, value):
+        self.__items[key] = value
+        self.__items.move_to_end(key)
+        if self.__size is not None:
+            while len(self.__items) > self.__size:
+                self.__items.popitem(last=False)
+                self.__evictions += 1
+
+    def __delitem__(self, key):
+        del self.__items[key]
+
+    @property
+    def size(self):
+        """Maximum number of items (read-only).
+        """
+        return self.__size
+
+    @property
+    def hits(self):
+        """Number of hits (read-only).
+        """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """Number of misses (read-only).
+        """
+        return self.__misses
+
+    @property
+    def evictions(self):
+        """Number of evictions (read-only).
+        """
+        return self.__evictions
+
+    def get(self, key, default=None):
+        """Return item by key marking it as recently used.
+        """
+        try:
+            value = self.__items[key]
+        except KeyError:
+            self.__misses += 1
+            return default
+        self.__items.move_to_end(key)
+        self.__hits += 1
+        return value
+
+    def clear(self):
+        """Remove all items.
+        """
+        self.__items.clear()
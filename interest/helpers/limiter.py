@@ -0,0 +1,150 @@
+import asyncio
+from collections import deque
+
+
+class Limiter:
+    """Limiter is a concurrency limit with a bounded wait queue.
+
+    Limiter admits up to the limit of concurrent holders. Others wait
+    in the queue up to the timeout or are rejected at once if the queue
+    is full. With the target latency the limit is adaptive (AIMD):
+    it grows by one per limit of fast releases and is decreased
+    multiplicatively on a release slower than the target.
+
+    Parameters
+    ----------
+    limit: int
+        Maximum number of concurrent holders (initial limit if adaptive).
+    queue_size: int
+        Maximum number of waiting acquirers.
+    queue_timeout: float
+        Time to wait in the queue in seconds (None for unlimited).
+    latency: float
+        Target latency in seconds (None for the fixed limit).
+    min_limit: int
+        Minimal adaptive limit.
+    max_limit: int
+        Maximal adaptive limit (defaults to 10 * limit).
+    """
+
+    # Public
+
+    def __init__(self, limit, *, queue_size=0, queue_timeout=None,
+                 latency=None, min_limit=1, max_limit=None):
+        if max_limit is None:
+            max_limit = limit * 10
+        self.__limit = limit
+        self.__queue_size = queue_size
+        self.__queue_timeout = queue_timeout
+        self.__latency = latency
+        self.__min_limit = min_limit
+        self.__max_limit = max_limit
+        self.__holders = 0
+        self.__waiters = deque()
+        self.__rejected = 0
+        self.__increase = 0
+
+    def __repr__(self):
+        template = (
+            '<Limiter limit="{self.limit}" holders="{self.holders}" '
+            'waiters="{self.waiters}" rejected="{self.rejected}">')
+        compiled = template.format(self=self)
+        return compiled
+
+    @property
+    def limit(self):
+        """Current limit (read-only).
+        """
+        return int(self.__limit)
+
+    @property
+    def holders(self):
+        """Number of current holders (read-only).
+        """
+        return self.__holders
+
+    @property
+    def waiters(self):
+        """Number of waiting acquirers (read-only).
+        """
+        return len(self.__waiters)
+
+    @property
+    def rejected(self):
+        """Number of rejected acquirers (read-only).
+        """
+        return self.__rejected
+
+    @asyncio.coroutine
+    def acquire(self, *, loop):
+        """Acquire a place (coroutine).
+
+        Parameters
+        ----------
+        loop: object
+            asyncio's loop.
+
+        Returns
+        -------
+        bool
+            True if acquired, False if rejected.
+        """
+        if self.__holders < self.limit and not self.__waiters:
+            self.__holders += 1
+            return True
+        if len(self.__waiters) >= self.__queue_size:
+            self.__rejected += 1
+            return False
+        waiter = asyncio.Future(loop=loop)
+        self.__waiters.append(waiter)
+        timer = None
+        if self.__queue_timeout is not None:
+            timer = loop.call_later(
+                self.__queue_timeout, self.__expire, waiter)
+        try:
+            acquired = yield from waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if waiter in self.__waiters:
+                self.__waiters.remove(waiter)
+        if not acquired:
+            self.__rejected += 1
+        return acquired
+
+    def release(self, duration=None):
+        """Release a place.
+
+        Parameters
+        ----------
+        duration: float
+            Holding time in seconds to adapt the limit.
+        """
+        self.__holders -= 1
+        if self.__latency is not None and duration is not None:
+            self.__adapt(duration)
+        while self.__waiters and self.__holders < self.limit:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                self.__holders += 1
+                waiter.set_result(True)
+
+    # Private
+
+    def __adapt(self, duration):
+        if duration > self.__latency:
+            self.__limit = max(self.__min_limit, self.__limit * 0.9)
+            self.__increase = 0
+            return
+        self.__increase += 1
+        if self.__increase >= self.__limit:
+            self.__limit = min(self.__max_limit, self.__limit + 1)
+            self.__increase = 0
+
+    def __expire(self, waiter):
+        if not waiter.done():
+            waiter.set_result(False)
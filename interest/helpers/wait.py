@@ -0,0 +1,46 @@
+import asyncio
+
+
+@asyncio.coroutine
+def wait(coroutine, *, loop, timeout=None):
+    """Run coroutine as a task cancelled after the timeout (coroutine).
+
+    Cancellation of the waiting coroutine is propagated to the task.
+
+    Parameters
+    ----------
+    coroutine: coroutine
+        Coroutine or task to run.
+    loop: object
+        asyncio's loop.
+    timeout: float
+        Timeout in seconds (None for no timeout).
+
+    Returns
+    -------
+    object
+        Coroutine's result.
+
+    Raises
+    ------
+    asyncio.TimeoutError
+        If the timeout is exceeded.
+    """
+    task = coroutine
+    if not isinstance(task, asyncio.Future):
+        task = loop.create_task(coroutine)
+    if timeout is None:
+        return (yield from task)
+    expired = []
+    def expire():
+        expired.append(True)
+        task.cancel()
+    handle = loop.call_later(max(timeout, 0), expire)
+    try:
+        return (yield from task)
+    except asyncio.CancelledError:
+        if expired:
+            raise asyncio.TimeoutError()
+        raise
+    finally:
+        handle.cancel()
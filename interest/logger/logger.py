@@ -1,4 +1,9 @@
+import os
+import re
+import time
 import logging
+import threading
+from queue import Queue, Empty, Full
 from ..helpers import Config
 
 
@@ -19,6 +24,19 @@ class Logger(Config):
         System logger instance.
     template: str
         Template for access formatting.
+    buffer_size: int
+        Size of the access records queue. If it's set records
+        are formatted and written by a background thread in batches
+        still as one log record per line (None for synchronous
+        access logging).
+    flush_size: int
+        Maximum number of records written in one batch.
+    flush_interval: float
+        Time to wait for a batch to fill in seconds.
+    overflow: str
+        Policy if the queue is full: 'drop' or 'block'. Blocking put
+        is run in the loop's executor and the handler waits for it
+        before processing the connection's next request.
 
     Examples
     --------
@@ -39,6 +57,10 @@ class Logger(Config):
                 pass
 
         logger = ProductionLogger()
+
+    To take access logging off the request path let's buffer records::
+
+        logger = Logger('<service>', buffer_size=10000, flush_size=100)
     """
 
     # Public
@@ -51,14 +73,48 @@ class Logger(Config):
     """Default template parameter.
     """
 
-    def __init__(self, service, *, system=None, template=None):
+    BUFFER_SIZE = None
+    """Default buffer_size parameter.
+    """
+    FLUSH_SIZE = 100
+    """Default flush_size parameter.
+    """
+    FLUSH_INTERVAL = 1
+    """Default flush_interval parameter.
+    """
+    OVERFLOW = 'drop'
+    """Default overflow parameter.
+    """
+
+    def __init__(self, service, *, system=None, template=None,
+                 buffer_size=None, flush_size=None, flush_interval=None,
+                 overflow=None):
         if system is None:
             system = self.SYSTEM
         if template is None:
             template = self.TEMPLATE
+        if buffer_size is None:
+            buffer_size = self.BUFFER_SIZE
+        if flush_size is None:
+            flush_size = self.FLUSH_SIZE
+        if flush_interval is None:
+            flush_interval = self.FLUSH_INTERVAL
+        if overflow is None:
+            overflow = self.OVERFLOW
+        if overflow not in ['drop', 'block']:
+            raise ValueError(
+                'Unsupported overflow {overflow}'.format(overflow=overflow))
         self.__service = service
         self.__system = system
         self.__template = template
+        self.__keys = tuple(self.__KEY_PATTERN.findall(template))
+        self.__buffer_size = buffer_size
+        self.__flush_size = flush_size
+        self.__flush_interval = flush_interval
+        self.__overflow = overflow
+        self.__queue = None
+        self.__pid = None
+        self.__dropped = 0
 
     @property
     def service(self):
@@ -78,6 +134,12 @@ class Logger(Config):
         """
         return self.__template
 
+    @property
+    def dropped(self):
+        """Number of access records dropped on overflow (read-only).
+        """
+        return self.__dropped
+
     def access(self, record):
         """Log access event.
 
@@ -85,8 +147,35 @@ class Logger(Config):
         ----------
         record: :class:`.Record`
             Record dict to use with template.
+
+        Returns
+        -------
+        object
+            Future to wait for if the record is blocked
+            by the full queue or None.
+        """
+        if self.__buffer_size is None:
+            self.info(self.template % record)
+            return None
+        # Load used items while request data is available
+        for key in self.__keys:
+            record[key]
+        queue = self.__get_queue()
+        try:
+            queue.put_nowait(record)
+        except Full:
+            if self.__overflow == 'block':
+                # Don't block the loop waiting for the writer
+                return self.service.loop.run_in_executor(
+                    None, queue.put, record)
+            self.__dropped += 1
+        return None
+
+    def flush(self):
+        """Wait for all buffered access records to be written.
         """
-        self.info(self.template % record)
+        if self.__queue is not None and self.__pid == os.getpid():
+            self.__queue.join()
 
     def debug(self, message, *args, **kwargs):
         """Log debug event.
@@ -129,3 +218,38 @@ class Logger(Config):
         Compatible with logging.critical signature.
         """
         self.system.critical(message, *args, **kwargs)
+
+    # Private
+
+    __KEY_PATTERN = re.compile(r'%\((.*?)\)')
+
+    def __get_queue(self):
+        # Thread doesn't survive fork
+        if self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__queue = Queue(self.__buffer_size)
+            thread = threading.Thread(
+                target=self.__write, args=(self.__queue,), daemon=True)
+            thread.start()
+        return self.__queue
+
+    def __write(self, queue):
+        while True:
+            batch = [queue.get()]
+            deadline = time.monotonic() + self.__flush_interval
+            while len(batch) < self.__flush_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(queue.get(timeout=timeout))
+                except Empty:
+                    break
+            # One log record per line for formatters and handlers
+            for record in batch:
+                try:
+                    self.info(self.template % record)
+                except Exception:
+                    self.exception('Access record writing failed')
+                finally:
+                    queue.task_done()
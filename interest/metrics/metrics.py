@@ -0,0 +1,393 @@
+import asyncio
+from bisect import bisect_left
+from ..backend import http
+from ..helpers import Config
+
+
+class Metrics(Config):
+    """Metrics is a component responsible for the request metrics.
+
+    Metrics collects per endpoint request counters, in-flight gauges,
+    status code counters and latency histograms with fixed buckets.
+    :class:`.Executor` queue depth is exposed as gauges.
+    Series are labelled by the endpoint's dotted name understood by
+    :meth:`.Service.url`. Mounted services' endpoints are recorded
+    by the main service's metrics. Series are allocated once per endpoint
+    and recording only updates numbers so it's safe to call from
+    the event loop without any locking. Every worker process
+    has its own metrics.
+
+    In profiling mode every matched middleware and endpoint
+    on the chain is timed. Wall and self (wall minus nested middlewares)
+    times are collected to the per request trace and emitted
+    as the Server-Timing response header (also available as the
+    timing item of the access :class:`.Record`). With profiling disabled
+    the chain pays only for one flag check per middleware.
+
+    .. seealso:: Implements:
+        :class:`.Config`
+
+    Parameters
+    ----------
+    service: :class:`.Service`
+        Service instance.
+    buckets: list
+        Sorted latency histogram buckets in seconds.
+    path: str
+        HTTP path of the builtin exposition endpoint
+        (None to not add the endpoint).
+    profile: bool
+        Enable per middleware timing.
+
+    Examples
+    --------
+    Let's expose metrics in Prometheus text format::
+
+        class Metrics(Metrics):
+
+            # Public
+
+            PATH = '/metrics'
+
+        service = Service(metrics=Metrics)
+
+    To find where latency goes let's profile the chain::
+
+        metrics = Metrics('<service>', profile=True)
+        response = yield from service('<request>')
+        metrics.trace('<request>')  # [('auth', 0.003, 0.001), ...]
+    """
+
+    # Public
+
+    BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+    """Default buckets parameter.
+    """
+    PATH = None
+    """Default path parameter.
+    """
+    PROFILE = False
+    """Default profile parameter.
+    """
+
+    def __init__(self, service, *, buckets=None, path=None, profile=None):
+        if buckets is None:
+            buckets = self.BUCKETS.copy()
+        if path is None:
+            path = self.PATH
+        if profile is None:
+            profile = self.PROFILE
+        self.__service = service
+        self.__buckets = sorted(buckets)
+        self.__path = path
+        self.__profile = profile
+        self.__series = {}
+        self.__labels = {}
+        if path is not None:
+            self.__add_endpoint(path)
+
+    @property
+    def service(self):
+        """:class:`.Service` instance (read-only).
+        """
+        return self.__service
+
+    @property
+    def buckets(self):
+        """List of latency histogram buckets (read-only).
+        """
+        return list(self.__buckets)
+
+    @property
+    def path(self):
+        """HTTP path of the exposition endpoint (read-only).
+        """
+        return self.__path
+
+    @property
+    def profile(self):
+        """Profiling mode flag (read-only).
+        """
+        return self.__profile
+
+    def begin(self, endpoint):
+        """Record a request start.
+
+        Parameters
+        ----------
+        endpoint: :class:`.Endpoint`
+            Endpoint processing the request.
+
+        Returns
+        -------
+        float
+            Start time to pass to :meth:`.Metrics.end`.
+        """
+        series = self.__get_series(endpoint)
+        series.inflight += 1
+        return self.service.loop.time()
+
+    def end(self, endpoint, start, status):
+        """Record a request end.
+
+        Parameters
+        ----------
+        endpoint: :class:`.Endpoint`
+            Endpoint processed the request.
+        start: float
+            Start time returned by :meth:`.Metrics.begin`.
+        status: int
+            Response status code.
+        """
+        series = self.__get_series(endpoint)
+        duration = self.service.loop.time() - start
+        series.inflight -= 1
+        series.requests += 1
+        series.sum += duration
+        series.counts[bisect_left(self.__buckets, duration)] += 1
+        series.statuses[status] = series.statuses.get(status, 0) + 1
+
+    def expose(self):
+        """Return metrics in Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            Exposition text.
+        """
+        lines = []
+        series = sorted(self.__series.values(), key=lambda item: item.label)
+        lines.append('# HELP interest_requests_total Processed requests.')
+        lines.append('# TYPE interest_requests_total counter')
+        for item in series:
+            lines.append('interest_requests_total{{{labels}}} {value}'.
+                format(labels=item.labels, value=item.requests))
+        lines.append('# HELP interest_responses_total Responses by status.')
+        lines.append('# TYPE interest_responses_total counter')
+        for item in series:
+            for status, value in sorted(item.statuses.items()):
+                lines.append(
+                    'interest_responses_total{{{labels},status="{status}"}} '
+                    '{value}'.format(
+                        labels=item.labels, status=status, value=value))
+        lines.append('# HELP interest_requests_in_flight In-flight requests.')
+        lines.append('# TYPE interest_requests_in_flight gauge')
+        for item in series:
+            lines.append('interest_requests_in_flight{{{labels}}} {value}'.
+                format(labels=item.labels, value=item.inflight))
+        lines.append('# HELP interest_request_duration_seconds '
+                     'Request duration.')
+        lines.append('# TYPE interest_request_duration_seconds histogram')
+        for item in series:
+            total = 0
+            bounds = [str(bucket) for bucket in self.__buckets] + ['+Inf']
+            for bound, count in zip(bounds, item.counts):
+                total += count
+                lines.append(
+                    'interest_request_duration_seconds_bucket'
+                    '{{{labels},le="{bound}"}} {value}'.format(
+                        labels=item.labels, bound=bound, value=total))
+            lines.append(
+                'interest_request_duration_seconds_sum{{{labels}}} {value}'.
+                format(labels=item.labels, value=item.sum))
+            lines.append(
+                'interest_request_duration_seconds_count{{{labels}}} {value}'.
+                format(labels=item.labels, value=item.requests))
+        executor = self.service.executor
+        for name, help, getter in [
+                ('size', 'Executor workers.',
+                    executor.size),
+                ('pending', 'Offloaded calls queued or running.',
+                    executor.pending),
+                ('queued', 'Offloaded calls waiting for a worker.',
+                    executor.queued)]:
+            lines.append('# HELP interest_executor_{name} {help}'.
+                format(name=name, help=help))
+            lines.append('# TYPE interest_executor_{name} gauge'.
+                format(name=name))
+            for kind in ['thread', 'process']:
+                lines.append(
+                    'interest_executor_{name}{{kind="{kind}"}} {value}'.
+                    format(name=name, kind=kind, value=getter(kind)))
+        return '\n'.join(lines) + '\n'
+
+    @asyncio.coroutine
+    def measure(self, middleware, request, coroutine):
+        """Time the middleware's coroutine in the request's trace (coroutine).
+
+        Parameters
+        ----------
+        middleware: :class:`.Middleware`
+            Middleware processing the request.
+        request: :class:`.http.Request`
+            Request instance.
+        coroutine: coroutine
+            Middleware's processing coroutine.
+
+        Returns
+        -------
+        object
+            Reply value.
+        """
+        trace = getattr(request, self.__TRACE, None)
+        if trace is None:
+            trace = Trace()
+            setattr(request, self.__TRACE, trace)
+        loop = self.service.loop
+        label = self.__get_label(middleware)
+        start = loop.time()
+        trace.enter()
+        response = None
+        try:
+            response = yield from coroutine
+            return response
+        except http.Exception as exception:
+            response = exception
+            raise
+        finally:
+            trace.exit(label, loop.time() - start)
+            headers = getattr(response, 'headers', None)
+            if trace.root and headers is not None:
+                headers['SERVER-TIMING'] = trace.format()
+
+    def trace(self, request):
+        """Return the request's trace collected in profiling mode.
+
+        Parameters
+        ----------
+        request: :class:`.http.Request`
+            Request instance.
+
+        Returns
+        -------
+        list
+            List of (label, wall time, self time) tuples in seconds
+            in order of the middlewares' completion.
+        """
+        trace = getattr(request, self.__TRACE, None)
+        if trace is None:
+            return []
+        return list(trace.items)
+
+    @asyncio.coroutine
+    def respond(self, request):
+        """Respond with the main service's exposition text (coroutine).
+
+        Parameters
+        ----------
+        request: :class:`.http.Request`
+            Request instance.
+
+        Returns
+        -------
+        :class:`.http.Response`
+            Response instance.
+        """
+        text = self.service.metrics.expose()
+        return http.Response(
+            body=text.encode('utf-8'),
+            headers={'CONTENT-TYPE': self.__CONTENT_TYPE})
+
+    # Private
+
+    __CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+    __TRACE = '_{name}.trace'.format(name=__name__)
+
+    def __add_endpoint(self, path):
+        from ..endpoint import Endpoint
+        endpoint = Endpoint(self.service,
+            name='metrics', prefix=path, methods=['GET'],
+            respond=self.respond)
+        self.service.push(endpoint, index=0)
+
+    def __get_series(self, endpoint):
+        series = self.__series.get(endpoint)
+        if series is None:
+            series = Series(self.__get_label(endpoint), self.__buckets)
+            self.__series[endpoint] = series
+        return series
+
+    def __get_label(self, middleware):
+        label = self.__labels.get(middleware)
+        if label is None:
+            names = []
+            current = middleware
+            while current is not current.over:
+                if current.name is not None:
+                    names.append(current.name)
+                current = current.over
+            label = '.'.join(reversed(names))
+            if not label:
+                label = middleware.name or 'service'
+            self.__labels[middleware] = label
+        return label
+
+
+class Series:
+    """Metrics series of an endpoint.
+    """
+
+    # Public
+
+    __slots__ = ['label', 'labels', 'requests', 'inflight',
+                 'sum', 'counts', 'statuses']
+
+    def __init__(self, label, buckets):
+        self.label = label
+        self.labels = 'endpoint="{label}"'.format(label=self.__escape(label))
+        self.requests = 0
+        self.inflight = 0
+        self.sum = 0.0
+        self.counts = [0] * (len(buckets) + 1)
+        self.statuses = {}
+
+    def __repr__(self):
+        template = '<Series label="{self.label}" requests={self.requests}>'
+        compiled = template.format(self=self)
+        return compiled
+
+    # Private
+
+    @staticmethod
+    def __escape(value):
+        value = value.replace('\\', '\\\\')
+        value = value.replace('"', '\\"')
+        value = value.replace('\n', '\\n')
+        return value
+
+
+class Trace:
+    """Timing trace of a request.
+    """
+
+    # Public
+
+    __slots__ = ['items', 'stack']
+
+    def __init__(self):
+        self.items = []
+        self.stack = []
+
+    def __repr__(self):
+        template = '<Trace items={self.items}>'
+        compiled = template.format(self=self)
+        return compiled
+
+    @property
+    def root(self):
+        return not self.stack
+
+    def enter(self):
+        self.stack.append(0)
+
+    def exit(self, label, wall):
+        nested = self.stack.pop()
+        self.items.append((label, wall, wall - nested))
+        if self.stack:
+            self.stack[-1] += wall
+
+    def format(self):
+        return ', '.join(
+            '{label};dur={wall:.3f};desc="self={own:.3f}"'.format(
+                label=label, wall=wall * 1000, own=own * 1000)
+            for label, wall, own in self.items)
@@ -96,6 +96,7 @@ class Middleware(Chain, Config, metaclass=OrderedMetaclass):
         self.__service = service
         self.__name = name
         self.__prefix = prefix
+        self.__path = prefix
         self.__methods = methods
         self.__endpoint = endpoint
         self.__add_middlewares(middlewares)
@@ -118,6 +119,10 @@ class Middleware(Chain, Config, metaclass=OrderedMetaclass):
         match = self.service.match(
             request, root=self.path, methods=self.methods)
         if match:
+            metrics = self.service.metrics
+            if metrics.profile:
+                return (yield from metrics.measure(
+                    self, request, self.process(request)))
             return (yield from self.process(request))
         return (yield from self.next(request))
 
@@ -145,11 +150,10 @@ class Middleware(Chain, Config, metaclass=OrderedMetaclass):
     @property
     def path(self):
         """HTTP full path constraint. (read-only).
+
+        Path is computed on topology changes (push/pull).
         """
-        path = self.__prefix
-        if self is not self.over:
-            path = self.over.path + path
-        return path
+        return self.__path
 
     @property
     def methods(self):
@@ -241,6 +245,11 @@ class Middleware(Chain, Config, metaclass=OrderedMetaclass):
                 self.push(endpoint)
 
     def __update_topology(self):
+        # Compiled routes are outdated
+        self.service.reset()
+        self.__path = self.__prefix
+        if self is not self.over:
+            self.__path = self.over.path + self.__prefix
         for index, middleware in enumerate(self):
             if isinstance(middleware, Middleware):
                 # Override attributes
@@ -0,0 +1,5 @@
+from .caching import Caching
+from .compression import Compression
+from .conditional import Conditional
+from .static import Static
+from .throttling import Throttling, Store
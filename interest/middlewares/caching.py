@@ -0,0 +1,205 @@
+import asyncio
+from ..backend import http
+from ..helpers import Cache
+from ..middleware import Middleware
+from .lookup import lookup
+
+
+class Caching(Middleware):
+    """Caching is a middleware to cache responses in memory.
+
+    Caching stores successful GET/HEAD responses of the nested endpoints
+    keyed by method, path with query string (so by match parameters too)
+    and selected request headers. Responses are kept in the bounded
+    LRU :class:`.Cache` until endpoint's TTL expires. Endpoint's TTL
+    is set by the ttl binding argument (ttl=0 disables caching).
+    Concurrent misses for the same key are coalesced into one
+    upstream call so an expired item doesn't cause a thundering herd.
+    Private responses are never shared: responses with Set-Cookie
+    or Cache-Control private/no-store/no-cache and responses
+    to requests with Authorization are not cached. Responses varying
+    on request headers not in the key (see the Vary header) are not
+    cached too, e.g. with the :class:`.Compression` placed after
+    the caching add Accept-Encoding to the headers.
+
+    .. seealso:: Implements:
+        :class:`.Middleware`,
+        :class:`.Chain`,
+        :class:`.Config`
+
+    Parameters
+    ----------
+    ttl: float
+        Default time to live of a response in seconds.
+    size: int
+        Maximum number of cached responses.
+    max_length: int
+        Maximum body length of a cached response in bytes
+        (so memory is bounded by size * max_length).
+    headers: list
+        Request headers to add to the key.
+
+    Examples
+    --------
+    Let's cache comments for a minute and the list for five seconds::
+
+        class Comment(Middleware):
+
+            # Public
+
+            PREFIX = '/comment'
+            MIDDLEWARES = [Caching.config(ttl=60, headers=['ACCEPT'])]
+
+            @http.get('/key=<key:int>')
+            def read(self, request, key):
+                return http.Response(text=str(key))
+
+            @http.get('/list', ttl=5)
+            def list(self, request):
+                return http.Response(text='<list>')
+
+    Caching middleware caches responses of the next middlewares
+    so it must be placed before the endpoints it's going to cache.
+    """
+
+    # Public
+
+    TTL = 60
+    """Default ttl parameter.
+    """
+    SIZE = 1000
+    """Default size parameter.
+    """
+    MAX_LENGTH = 1024 * 1024
+    """Default max_length parameter.
+    """
+    HEADERS = []
+    """Default headers parameter.
+    """
+
+    def __init__(self, service, *,
+                 name=None, prefix=None, methods=None,
+                 middlewares=None, endpoint=None,
+                 ttl=None, size=None, max_length=None, headers=None):
+        if ttl is None:
+            ttl = self.TTL
+        if size is None:
+            size = self.SIZE
+        if max_length is None:
+            max_length = self.MAX_LENGTH
+        if headers is None:
+            headers = self.HEADERS.copy()
+        super().__init__(service,
+            name=name, prefix=prefix, methods=methods,
+            middlewares=middlewares, endpoint=endpoint)
+        self.__ttl = ttl
+        self.__max_length = max_length
+        self.__headers = [header.upper() for header in headers]
+        self.__cache = Cache(size)
+        self.__pending = {}
+
+    @property
+    def cache(self):
+        """:class:`.Cache` of responses (read-only).
+        """
+        return self.__cache
+
+    @asyncio.coroutine
+    def process(self, request):
+        if request.method not in self.__METHODS:
+            return (yield from self.next(request))
+        key = self.__make_key(request)
+        while True:
+            item = self.__get_item(key)
+            if item is not None:
+                return self.__make_response(item)
+            future = self.__pending.get(key)
+            if future is None:
+                break
+            # Wait for the same key's upstream call
+            item = yield from asyncio.shield(future)
+            if item is None:
+                return (yield from self.next(request))
+        future = asyncio.Future(loop=self.service.loop)
+        self.__pending[key] = future
+        item = None
+        try:
+            response = yield from self.next(request)
+            item = self.__make_item(request, response)
+            if item is not None:
+                self.__cache[key] = item
+        finally:
+            del self.__pending[key]
+            future.set_result(item)
+        return response
+
+    # Private
+
+    __METHODS = frozenset(['GET', 'HEAD'])
+    __PRIVATE = frozenset(['private', 'no-store', 'no-cache'])
+
+    def __make_key(self, request):
+        headers = tuple(
+            request.headers.get(header) for header in self.__headers)
+        return (request.method, request.path_qs, headers)
+
+    def __get_item(self, key):
+        item = self.__cache.get(key)
+        if item is None:
+            return None
+        expires, status, headers, body = item
+        if expires <= self.service.loop.time():
+            del self.__cache[key]
+            return None
+        return item
+
+    def __make_item(self, request, response):
+        if type(response) is not http.Response:
+            return None
+        if response.status != 200:
+            return None
+        if not self.__check_shared(request, response):
+            return None
+        if not self.__check_vary(response):
+            return None
+        body = response.body
+        if body is None or len(body) > self.__max_length:
+            return None
+        ttl = self.__get_ttl(request)
+        if not ttl:
+            return None
+        expires = self.service.loop.time() + ttl
+        headers = dict(response.headers)
+        return (expires, response.status, headers, body)
+
+    def __check_shared(self, request, response):
+        if request.headers.get('AUTHORIZATION') is not None:
+            return False
+        if response.headers.get('SET-COOKIE') is not None:
+            return False
+        control = response.headers.get('CACHE-CONTROL', '').lower()
+        directives = {item.split('=')[0].strip()
+                      for item in control.split(',')}
+        if directives & self.__PRIVATE:
+            return False
+        return True
+
+    def __check_vary(self, response):
+        vary = response.headers.get('VARY')
+        if vary is None:
+            return True
+        for header in vary.split(','):
+            header = header.strip().upper()
+            if header and header not in self.__headers:
+                return False
+        return True
+
+    def __make_response(self, item):
+        expires, status, headers, body = item
+        return http.Response(body=body, status=status, headers=headers)
+
+    def __get_ttl(self, request):
+        endpoint, match = lookup(self, request)
+        if endpoint is None:
+            return self.__ttl
+        return endpoint.extra.get('ttl', self.__ttl)
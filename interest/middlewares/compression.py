@@ -0,0 +1,183 @@
+import zlib
+import asyncio
+from ..backend import http
+from ..middleware import Middleware
+
+
+class Compression(Middleware):
+    """Compression is a middleware to compress responses.
+
+    Compression negotiates Accept-Encoding (gzip and deflate
+    are supported) and compresses responses of the next middlewares
+    if the body is longer than the minimal length and the content type
+    is in the allowed list. Bodies longer than the thread length
+    are compressed in the loop's executor so the loop is not blocked.
+    Not started :class:`.http.StreamResponse` instances are switched
+    to the aiohttp's streaming compression if deflate is accepted
+    (aiohttp's streaming compression always uses deflate).
+
+    .. seealso:: Implements:
+        :class:`.Middleware`,
+        :class:`.Chain`,
+        :class:`.Config`
+
+    Parameters
+    ----------
+    level: int
+        Compression level from 1 (fastest) to 9 (smallest).
+    min_length: int
+        Minimal body length to compress in bytes.
+    thread_length: int
+        Minimal body length to compress in the executor in bytes
+        (None to always compress in the loop).
+    types: list
+        Allowed content types (a type ending with '/' matches
+        all subtypes).
+
+    Examples
+    --------
+    Let's compress everything the service responds with::
+
+        service = Service(
+            middlewares=[Compression.config(level=5), '<middleware>'])
+    """
+
+    # Public
+
+    LEVEL = 6
+    """Default level parameter.
+    """
+    MIN_LENGTH = 1024
+    """Default min_length parameter.
+    """
+    THREAD_LENGTH = 1024 * 1024
+    """Default thread_length parameter.
+    """
+    TYPES = [
+        'text/',
+        'application/json',
+        'application/javascript',
+        'application/xml',
+        'image/svg+xml']
+    """Default types parameter.
+    """
+
+    def __init__(self, service, *,
+                 name=None, prefix=None, methods=None,
+                 middlewares=None, endpoint=None,
+                 level=None, min_length=None, thread_length=None,
+                 types=None):
+        if level is None:
+            level = self.LEVEL
+        if min_length is None:
+            min_length = self.MIN_LENGTH
+        if thread_length is None:
+            thread_length = self.THREAD_LENGTH
+        if types is None:
+            types = self.TYPES.copy()
+        super().__init__(service,
+            name=name, prefix=prefix, methods=methods,
+            middlewares=middlewares, endpoint=endpoint)
+        self.__level = level
+        self.__min_length = min_length
+        self.__thread_length = thread_length
+        self.__types = types
+
+    @asyncio.coroutine
+    def process(self, request):
+        response = yield from self.next(request)
+        encoding = self.__negotiate(request)
+        if encoding is None or not self.__check(response):
+            return response
+        if isinstance(response, http.Response):
+            body = response.body
+            if body is None or len(body) < self.__min_length:
+                return response
+            if (self.__thread_length is not None and
+                    len(body) >= self.__thread_length):
+                body = yield from self.service.loop.run_in_executor(
+                    None, self.__compress, body, encoding)
+            else:
+                body = self.__compress(body, encoding)
+            response.body = body
+            response.headers['CONTENT-ENCODING'] = encoding
+        elif not getattr(response, 'started', True):
+            enable = getattr(response, 'enable_compression', None)
+            if enable is None:
+                return response
+            if self.__negotiate(request, self.__STREAM_ENCODINGS) is None:
+                return response
+            enable()
+        else:
+            return response
+        self.__update_headers(response)
+        return response
+
+    # Private
+
+    __ENCODINGS = ['gzip', 'deflate']
+    __STREAM_ENCODINGS = ['deflate']
+    __WBITS = {'gzip': 16 + zlib.MAX_WBITS, 'deflate': zlib.MAX_WBITS}
+
+    def __negotiate(self, request, encodings=None):
+        if encodings is None:
+            encodings = self.__ENCODINGS
+        header = request.headers.get('ACCEPT-ENCODING')
+        if not header:
+            return None
+        weights = {}
+        for item in header.split(','):
+            coding, *params = item.strip().split(';')
+            weight = 1.0
+            for param in params:
+                key, _, value = param.strip().partition('=')
+                if key == 'q':
+                    try:
+                        weight = float(value)
+                    except ValueError:
+                        weight = 0.0
+            weights[coding.strip().lower()] = weight
+        default = weights.get('*', 0.0)
+        best = None
+        for encoding in encodings:
+            weight = weights.get(encoding, default)
+            if weight > 0 and (best is None or weight > best[1]):
+                best = (encoding, weight)
+        if best is None:
+            return None
+        return best[0]
+
+    def __check(self, response):
+        if not isinstance(response, http.StreamResponse):
+            return False
+        if isinstance(response, http.Exception):
+            return False
+        if response.status in (204, 304) or response.status < 200:
+            return False
+        if 'CONTENT-ENCODING' in response.headers:
+            return False
+        ctype = response.headers.get('CONTENT-TYPE', '')
+        ctype = ctype.split(';')[0].strip().lower()
+        for allowed in self.__types:
+            if allowed.endswith('/'):
+                if ctype.startswith(allowed):
+                    return True
+            elif ctype == allowed:
+                return True
+        return False
+
+    def __compress(self, body, encoding):
+        compressor = zlib.compressobj(
+            self.__level, zlib.DEFLATED, self.__WBITS[encoding])
+        return compressor.compress(body) + compressor.flush()
+
+    def __update_headers(self, response):
+        vary = response.headers.get('VARY')
+        if vary is None:
+            response.headers['VARY'] = 'Accept-Encoding'
+        elif 'accept-encoding' not in vary.lower():
+            response.headers['VARY'] = vary + ', Accept-Encoding'
+        # Compressed representation is not byte-identical
+        etag = response.headers.get('ETAG')
+        if etag is not None and not etag.startswith('W/'):
+            response.headers['ETAG'] = 'W/' + etag
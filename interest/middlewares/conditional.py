@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+from email.utils import parsedate_to_datetime
+from ..backend import http
+from ..middleware import Middleware
+from .lookup import lookup
+
+
+class Conditional(Middleware):
+    """Conditional is a middleware to answer conditional GET requests.
+
+    Conditional adds ETag header to successful GET/HEAD responses
+    of the next middlewares. ETag is taken from the response, from
+    the endpoint's validator or computed as a hash of the body.
+    If the request's If-None-Match (or If-Modified-Since for responses
+    with Last-Modified header) validator matches :class:`.http.NotModified`
+    is raised instead of sending the body.
+
+    Endpoint could declare a cheap validator by the validator binding
+    argument. Validator is called with the same arguments as the endpoint
+    and returns ETag (or None). If it matches the request 304 is raised
+    before the endpoint is called at all.
+
+    .. seealso:: Implements:
+        :class:`.Middleware`,
+        :class:`.Chain`,
+        :class:`.Config`
+
+    Parameters
+    ----------
+    weak: bool
+        Emit computed ETags as weak validators.
+
+    Examples
+    --------
+    Let's skip reading a comment if the client has the current version::
+
+        def version(request, key):
+            return '"{version}"'.format(version=versions[key])
+
+        class Comment(Middleware):
+
+            # Public
+
+            PREFIX = '/comment'
+            MIDDLEWARES = [Conditional]
+
+            @http.get('/key=<key:int>', validator=version)
+            def read(self, request, key):
+                return http.Response(text=expensive_read(key))
+    """
+
+    # Public
+
+    WEAK = False
+    """Default weak parameter.
+    """
+
+    def __init__(self, service, *,
+                 name=None, prefix=None, methods=None,
+                 middlewares=None, endpoint=None, weak=None):
+        if weak is None:
+            weak = self.WEAK
+        super().__init__(service,
+            name=name, prefix=prefix, methods=methods,
+            middlewares=middlewares, endpoint=endpoint)
+        self.__weak = weak
+
+    @asyncio.coroutine
+    def process(self, request):
+        if request.method not in self.__METHODS:
+            return (yield from self.next(request))
+        etag = yield from self.__validate(request)
+        if etag is not None and self.__match_etag(request, etag):
+            raise http.NotModified(headers={'ETAG': etag})
+        response = yield from self.next(request)
+        if type(response) is not http.Response or response.status != 200:
+            return response
+        if 'ETAG' not in response.headers:
+            if etag is None:
+                etag = self.__make_etag(response.body)
+            if etag is not None:
+                response.headers['ETAG'] = etag
+        etag = response.headers.get('ETAG')
+        if etag is not None and self.__match_etag(request, etag):
+            raise http.NotModified(headers={'ETAG': etag})
+        if self.__match_date(request, response):
+            raise http.NotModified()
+        return response
+
+    # Private
+
+    __METHODS = frozenset(['GET', 'HEAD'])
+
+    @asyncio.coroutine
+    def __validate(self, request):
+        endpoint, match = lookup(self, request)
+        if endpoint is None:
+            return None
+        validator = endpoint.extra.get('validator')
+        if validator is None:
+            return None
+        etag = validator(request, **match)
+        if asyncio.iscoroutine(etag):
+            etag = yield from etag
+        return etag
+
+    def __make_etag(self, body):
+        if body is None:
+            return None
+        digest = hashlib.sha1()
+        digest.update(body)
+        etag = '"{hash}"'.format(hash=digest.hexdigest())
+        if self.__weak:
+            etag = 'W/' + etag
+        return etag
+
+    def __match_etag(self, request, etag):
+        header = request.headers.get('IF-NONE-MATCH')
+        if header is None:
+            return False
+        if header.strip() == '*':
+            return True
+        # Weak comparison (RFC 7232)
+        etag = self.__strip_weak(etag)
+        for candidate in header.split(','):
+            if self.__strip_weak(candidate.strip()) == etag:
+                return True
+        return False
+
+    def __match_date(self, request, response):
+        if 'IF-NONE-MATCH' in request.headers:
+            return False
+        since = request.headers.get('IF-MODIFIED-SINCE')
+        modified = response.headers.get('LAST-MODIFIED')
+        if since is None or modified is None:
+            return False
+        try:
+            return parsedate_to_datetime(modified) <= \
+                parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def __strip_weak(etag):
+        if etag.startswith('W/'):
+            return etag[2:]
+        return etag
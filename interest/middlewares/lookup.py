@@ -0,0 +1,33 @@
+from ..endpoint import Endpoint
+from ..middleware import Middleware
+
+
+def lookup(middleware, request):
+    """Find the endpoint next to the middleware to respond to the request.
+
+    Parameters
+    ----------
+    middleware: :class:`.Middleware`
+        Middleware to search the endpoints next to.
+    request: :class:`.http.Request`
+        Request instance.
+
+    Returns
+    -------
+    tuple
+        Endpoint and :class:`.Match` instances or (None, None).
+    """
+    for endpoint in walk(middleware.over):
+        match = middleware.service.match(
+            request, path=endpoint.path, methods=endpoint.methods)
+        if match:
+            return (endpoint, match)
+    return (None, None)
+
+
+def walk(middleware):
+    for submiddleware in middleware:
+        if isinstance(submiddleware, Endpoint):
+            yield submiddleware
+        elif isinstance(submiddleware, Middleware):
+            yield from walk(submiddleware)
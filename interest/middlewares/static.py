@@ -0,0 +1,298 @@
+import os
+import asyncio
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from ..backend import http
+from ..helpers import Cache
+from ..middleware import Middleware
+
+
+class Static(Middleware):
+    """Static is a middleware to serve files from a directory.
+
+    Static serves GET/HEAD requests under the middleware's path
+    with files from the root directory. Other requests and requests
+    to missing files are passed to the next middleware. Files are sent
+    by kernel's sendfile over the transport when possible with fallback
+    to chunked reads (e.g. for TLS). Range requests are answered
+    with 206 Partial Content and validators with 304 Not Modified.
+    Stat results and small files are kept in memory for a short time.
+
+    .. seealso:: Implements:
+        :class:`.Middleware`,
+        :class:`.Chain`,
+        :class:`.Config`
+
+    Parameters
+    ----------
+    root: str
+        Directory to serve files from.
+    cache_size: int
+        Maximum number of cached stat results.
+    cache_ttl: float
+        Time to keep a stat result in seconds.
+    max_cache_length: int
+        Maximum length of a file to keep in memory in bytes.
+    chunk_size: int
+        Chunk size for fallback reading in bytes.
+
+    Examples
+    --------
+    Let's serve assets from the local directory::
+
+        service = Service(middlewares=[
+            Static.config(prefix='/static', root='/var/www/static')])
+    """
+
+    # Public
+
+    ROOT = None
+    """Default root parameter.
+    """
+    CACHE_SIZE = 1000
+    """Default cache_size parameter.
+    """
+    CACHE_TTL = 1
+    """Default cache_ttl parameter.
+    """
+    MAX_CACHE_LENGTH = 64 * 1024
+    """Default max_cache_length parameter.
+    """
+    CHUNK_SIZE = 256 * 1024
+    """Default chunk_size parameter.
+    """
+
+    def __init__(self, service, *,
+                 name=None, prefix=None, methods=None,
+                 middlewares=None, endpoint=None,
+                 root=None, cache_size=None, cache_ttl=None,
+                 max_cache_length=None, chunk_size=None):
+        if root is None:
+            root = self.ROOT
+        if cache_size is None:
+            cache_size = self.CACHE_SIZE
+        if cache_ttl is None:
+            cache_ttl = self.CACHE_TTL
+        if max_cache_length is None:
+            max_cache_length = self.MAX_CACHE_LENGTH
+        if chunk_size is None:
+            chunk_size = self.CHUNK_SIZE
+        if root is None:
+            raise ValueError('Static root is not set')
+        super().__init__(service,
+            name=name, prefix=prefix, methods=methods,
+            middlewares=middlewares, endpoint=endpoint)
+        self.__root = os.path.realpath(root)
+        self.__cache = Cache(cache_size)
+        self.__cache_ttl = cache_ttl
+        self.__max_cache_length = max_cache_length
+        self.__chunk_size = chunk_size
+
+    @property
+    def root(self):
+        """Directory to serve files from (read-only).
+        """
+        return self.__root
+
+    @property
+    def cache(self):
+        """:class:`.Cache` of stat results (read-only).
+        """
+        return self.__cache
+
+    @asyncio.coroutine
+    def process(self, request):
+        if request.method not in self.__METHODS:
+            return (yield from self.next(request))
+        filepath = self.__get_filepath(request.path)
+        item = None
+        if filepath is not None:
+            item = self.__get_item(filepath)
+        if item is None:
+            return (yield from self.next(request))
+        headers = {
+            'CONTENT-TYPE': item.content_type,
+            'LAST-MODIFIED': item.last_modified,
+            'ETAG': item.etag,
+            'ACCEPT-RANGES': 'bytes'}
+        if self.__check_not_modified(request, item):
+            raise http.NotModified(headers={'ETAG': item.etag})
+        status = 200
+        offset = 0
+        count = item.size
+        crange = self.__parse_range(request, item.size)
+        if crange is not None:
+            offset, count = crange
+            status = 206
+            headers['CONTENT-RANGE'] = 'bytes {first}-{last}/{size}'.format(
+                first=offset, last=offset + count - 1, size=item.size)
+        headers['CONTENT-LENGTH'] = str(count)
+        if item.body is not None:
+            body = b''
+            if request.method != 'HEAD':
+                body = item.body[offset:offset + count]
+            response = http.Response(
+                body=body, status=status, headers=headers)
+            # HEAD response keeps the file's length
+            response.headers['CONTENT-LENGTH'] = str(count)
+            return response
+        response = http.StreamResponse(status=status)
+        for key, value in headers.items():
+            response.headers[key] = value
+        response.start(request)
+        if request.method != 'HEAD':
+            yield from self.__send(request, response, item, offset, count)
+        return response
+
+    # Private
+
+    __METHODS = frozenset(['GET', 'HEAD'])
+
+    def __get_filepath(self, path):
+        relpath = path[len(self.path):]
+        filepath = os.path.realpath(
+            os.path.join(self.__root, relpath.lstrip('/')))
+        if not filepath.startswith(self.__root + os.sep):
+            return None
+        return filepath
+
+    def __get_item(self, filepath):
+        now = self.service.loop.time()
+        item = self.__cache.get(filepath)
+        if item is not None and item.expires > now:
+            return item
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        if not os.path.isfile(filepath):
+            return None
+        if item is not None and item.mtime == stat.st_mtime:
+            item.expires = now + self.__cache_ttl
+            self.__cache[filepath] = item
+            return item
+        body = None
+        if stat.st_size <= self.__max_cache_length:
+            try:
+                with open(filepath, 'rb') as file:
+                    body = file.read()
+            except OSError:
+                return None
+        item = File(filepath, stat, body, now + self.__cache_ttl)
+        self.__cache[filepath] = item
+        return item
+
+    def __check_not_modified(self, request, item):
+        header = request.headers.get('IF-NONE-MATCH')
+        if header is not None:
+            etags = [etag.strip() for etag in header.split(',')]
+            return '*' in etags or item.etag in etags
+        since = request.headers.get('IF-MODIFIED-SINCE')
+        if since is None:
+            return False
+        try:
+            since = parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(item.mtime) <= since
+
+    def __parse_range(self, request, size):
+        header = request.headers.get('RANGE')
+        if header is None or not header.startswith('bytes='):
+            return None
+        spec = header[len('bytes='):].strip()
+        if ',' in spec:
+            # Multiple ranges are served as the full file
+            return None
+        first, sep, last = spec.partition('-')
+        try:
+            if not first:
+                count = min(int(last), size)
+                if count <= 0:
+                    raise ValueError()
+                return (size - count, count)
+            first = int(first)
+            last = int(last) if last else size - 1
+        except ValueError:
+            self.__raise_not_satisfiable(size)
+        if not sep or first > last or first >= size:
+            self.__raise_not_satisfiable(size)
+        last = min(last, size - 1)
+        return (first, last - first + 1)
+
+    def __raise_not_satisfiable(self, size):
+        raise http.RequestRangeNotSatisfiable(
+            headers={'CONTENT-RANGE': 'bytes */{size}'.format(size=size)})
+
+    @asyncio.coroutine
+    def __send(self, request, response, item, offset, count):
+        transport = request.transport
+        sock = transport.get_extra_info('socket')
+        with open(item.filepath, 'rb') as file:
+            if (sock is not None and hasattr(os, 'sendfile') and
+                    transport.get_extra_info('sslcontext') is None and
+                    not transport.get_write_buffer_size()):
+                future = asyncio.Future(loop=self.service.loop)
+                self.__sendfile(future, sock.fileno(), file.fileno(),
+                    offset, count, False)
+                yield from future
+                return
+            file.seek(offset)
+            while count > 0:
+                chunk = file.read(min(self.__chunk_size, count))
+                if not chunk:
+                    break
+                count -= len(chunk)
+                waiter = response.write(chunk)
+                if (asyncio.iscoroutine(waiter) or
+                        isinstance(waiter, asyncio.Future)):
+                    yield from waiter
+
+    def __sendfile(self, future, out_fd, in_fd, offset, count, registered):
+        loop = self.service.loop
+        if registered:
+            loop.remove_writer(out_fd)
+        if future.cancelled():
+            return
+        try:
+            sent = os.sendfile(out_fd, in_fd, offset, count)
+            if sent == 0:
+                # File has been truncated
+                sent = count
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except Exception as exception:
+            future.set_exception(exception)
+            return
+        if sent < count:
+            loop.add_writer(out_fd, self.__sendfile, future,
+                out_fd, in_fd, offset + sent, count - sent, True)
+        else:
+            future.set_result(None)
+
+
+class File:
+    """Static file's cached stat representation.
+    """
+
+    # Public
+
+    __slots__ = ['filepath', 'size', 'mtime', 'etag', 'last_modified',
+                 'content_type', 'body', 'expires']
+
+    def __init__(self, filepath, stat, body, expires):
+        self.filepath = filepath
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.etag = '"{mtime:x}-{size:x}"'.format(
+            mtime=int(stat.st_mtime * 1000000), size=stat.st_size)
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.content_type = (
+            mimetypes.guess_type(filepath)[0] or 'application/octet-stream')
+        self.body = body
+        self.expires = expires
+
+    def __repr__(self):
+        template = '<File filepath="{self.filepath}" size={self.size}>'
+        compiled = template.format(self=self)
+        return compiled
@@ -0,0 +1,288 @@
+import math
+import asyncio
+from ..backend import http
+from ..helpers import Config
+from ..middleware import Middleware
+
+
+class Throttling(Middleware):
+    """Throttling is a middleware to limit request rate per client.
+
+    Throttling counts requests by the key extracted from the request
+    (remote host by default) and raises :class:`.http.TooManyRequests`
+    with Retry-After header if the rate is exceeded. Token bucket
+    ('bucket') and sliding window ('window') algorithms are available.
+    Counters are kept in the :class:`.Store` which could be replaced
+    by a shared one.
+
+    .. seealso:: Implements:
+        :class:`.Middleware`,
+        :class:`.Chain`,
+        :class:`.Config`
+
+    Parameters
+    ----------
+    rate: int
+        Number of requests allowed per period.
+    period: float
+        Period in seconds.
+    burst: int
+        Token bucket capacity (defaults to rate).
+    algorithm: str
+        Algorithm: 'bucket' or 'window'.
+    key: callable
+        Function to extract a key from a request
+        (key None means the request is not limited).
+    store: type
+        :class:`.Store` subclass.
+
+    Examples
+    --------
+    Let's allow 10 requests per second with bursts of 20 per user::
+
+        service = Service(middlewares=[
+            Throttling.config(
+                rate=10, burst=20, key=lambda request: request.user),
+            '<middleware>'])
+    """
+
+    # Public
+
+    RATE = 10
+    """Default rate parameter.
+    """
+    PERIOD = 1
+    """Default period parameter.
+    """
+    BURST = None
+    """Default burst parameter.
+    """
+    ALGORITHM = 'bucket'
+    """Default algorithm parameter.
+    """
+    KEY = None
+    """Default key parameter.
+    """
+    STORE = None
+    """Default store parameter.
+    """
+
+    def __init__(self, service, *,
+                 name=None, prefix=None, methods=None,
+                 middlewares=None, endpoint=None,
+                 rate=None, period=None, burst=None, algorithm=None,
+                 key=None, store=None):
+        if rate is None:
+            rate = self.RATE
+        if period is None:
+            period = self.PERIOD
+        if burst is None:
+            burst = self.BURST
+        if burst is None:
+            burst = rate
+        if algorithm is None:
+            algorithm = self.ALGORITHM
+        if key is None:
+            key = self.KEY
+        if store is None:
+            store = self.STORE
+        if store is None:
+            store = Store
+        if algorithm not in self.__ALGORITHMS:
+            raise ValueError(
+                'Unsupported algorithm "{algorithm}"'.
+                format(algorithm=algorithm))
+        super().__init__(service,
+            name=name, prefix=prefix, methods=methods,
+            middlewares=middlewares, endpoint=endpoint)
+        self.__rate = rate
+        self.__period = period
+        self.__burst = burst
+        self.__algorithm = algorithm
+        self.__store = store(service)
+        # Override attributes
+        if key is not None:
+            self.key = key
+
+    @property
+    def store(self):
+        """:class:`.Store` instance (read-only).
+        """
+        return self.__store
+
+    @asyncio.coroutine
+    def process(self, request):
+        key = self.key(request)
+        if key is None:
+            return (yield from self.next(request))
+        if self.__algorithm == 'bucket':
+            delay = yield from self.__store.take(key,
+                rate=self.__rate / self.__period, burst=self.__burst)
+        else:
+            delay = yield from self.__store.count(key,
+                limit=self.__rate, window=self.__period)
+        if delay > 0:
+            raise http.TooManyRequests(
+                headers={'RETRY-AFTER': str(math.ceil(delay))})
+        return (yield from self.next(request))
+
+    def key(self, request):
+        """Return the request's key (remote host by default).
+
+        Parameters
+        ----------
+        request: :class:`.http.Request`
+            Request instance.
+
+        Returns
+        -------
+        object
+            Hashable key or None to not limit the request.
+        """
+        peername = request.transport.get_extra_info('peername')
+        if isinstance(peername, (list, tuple)):
+            return peername[0]
+        return None
+
+    # Private
+
+    __ALGORITHMS = ['bucket', 'window']
+
+
+class Store(Config):
+    """Store is a in-memory state of :class:`.Throttling`.
+
+    Store keeps counters in the shards of plain dicts.
+    Entries are expired lazily: a shard is swept of idle entries
+    when it's accessed after the sweep interval. There are no timers.
+    Shared store (e.g. over a network) should implement
+    the same coroutines.
+
+    .. seealso:: Implements:
+        :class:`.Config`
+
+    Parameters
+    ----------
+    service: :class:`.Service`
+        Service instance.
+    shards: int
+        Number of shards.
+    sweep_interval: float
+        Minimal time between shard's sweeps in seconds.
+    """
+
+    # Public
+
+    SHARDS = 16
+    """Default shards parameter.
+    """
+    SWEEP_INTERVAL = 60
+    """Default sweep_interval parameter.
+    """
+
+    def __init__(self, service, *, shards=None, sweep_interval=None):
+        if shards is None:
+            shards = self.SHARDS
+        if sweep_interval is None:
+            sweep_interval = self.SWEEP_INTERVAL
+        self.__service = service
+        self.__sweep_interval = sweep_interval
+        self.__shards = [{} for _ in range(shards)]
+        self.__sweeps = [0] * shards
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.__shards)
+
+    @property
+    def service(self):
+        """:class:`.Service` instance (read-only).
+        """
+        return self.__service
+
+    @asyncio.coroutine
+    def take(self, key, *, rate, burst):
+        """Take a token from the key's bucket (coroutine).
+
+        Parameters
+        ----------
+        key: object
+            Hashable key.
+        rate: float
+            Tokens added per second.
+        burst: int
+            Bucket capacity.
+
+        Returns
+        -------
+        float
+            Time to wait for a token in seconds (0 if taken).
+        """
+        now = self.service.loop.time()
+        shard = self.__get_shard(key, now)
+        entry = shard.get(key)
+        if entry is None:
+            # [tokens, updated, expires]
+            entry = [burst, now, 0]
+            shard[key] = entry
+        tokens = min(burst, entry[0] + (now - entry[1]) * rate)
+        entry[1] = now
+        entry[2] = now + burst / rate
+        if tokens < 1:
+            entry[0] = tokens
+            return (1 - tokens) / rate
+        entry[0] = tokens - 1
+        return 0
+
+    @asyncio.coroutine
+    def count(self, key, *, limit, window):
+        """Count a request in the key's sliding window (coroutine).
+
+        Parameters
+        ----------
+        key: object
+            Hashable key.
+        limit: int
+            Requests allowed per window.
+        window: float
+            Window in seconds.
+
+        Returns
+        -------
+        float
+            Time to wait for the next request in seconds (0 if counted).
+        """
+        now = self.service.loop.time()
+        shard = self.__get_shard(key, now)
+        entry = shard.get(key)
+        # Integer index avoids float comparison of window starts
+        index = int(now // window)
+        start = index * window
+        if entry is None:
+            # [index, current, previous, expires]
+            entry = [index, 0, 0, 0]
+            shard[key] = entry
+        if entry[0] != index:
+            previous = entry[1] if index - entry[0] == 1 else 0
+            entry[0:3] = [index, 0, previous]
+        entry[3] = start + 2 * window
+        elapsed = now - start
+        weight = 1 - elapsed / window
+        if entry[2] * weight + entry[1] + 1 > limit:
+            if entry[1] + 1 > limit or not entry[2]:
+                return window - elapsed
+            wait = window * (1 - (limit - entry[1] - 1) / entry[2]) - elapsed
+            return max(wait, 0.001)
+        entry[1] += 1
+        return 0
+
+    # Private
+
+    def __get_shard(self, key, now):
+        index = hash(key) % len(self.__shards)
+        shard = self.__shards[index]
+        if now >= self.__sweeps[index]:
+            self.__sweeps[index] = now + self.__sweep_interval
+            for expired in [item for item, entry in shard.items()
+                            if entry[-1] <= now]:
+                del shard[expired]
+        return shard
@@ -1,31 +1,91 @@
 import asyncio
-from .helpers import Config
+from .helpers import Config, name
 
 
 class Provider(Config):
     """Provider is a extended coroutine to update the service.
 
+    Providers are started concurrently by :class:`.Service`.
+    Provider is started after providers it depends on. Started providers
+    are closed in reverse order on the service's shutdown.
+
     Parameters
     ----------
     service: :class:`.Service`
         Service instance.
+    name: str
+        Provider's name (it has to be unique if other providers
+        depend on it).
+    depends: list
+        Names of providers to start before.
     provide: coroutine
         Coroutine for actual work.
+    close: coroutine
+        Coroutine to release resources.
+
+    Examples
+    --------
+    Let's provide the database pool to the service::
+
+        class Database(Provider):
+
+            # Public
+
+            @asyncio.coroutine
+            def provide(self, service):
+                service.db = yield from create_pool()
+
+            @asyncio.coroutine
+            def close(self, service):
+                yield from service.db.close()
+
+        class Cache(Provider):
+
+            # Public
+
+            DEPENDS = ['database']
+
+            @asyncio.coroutine
+            def provide(self, service):
+                service.cache = yield from create_cache(service.db)
+
+        service = Service(providers=[Cache, Database])
     """
 
     # Public
 
+    NAME = name
+    """Default name parameter.
+    """
+    DEPENDS = []
+    """Default depends parameter.
+    """
     PROVIDE = None
     """Default provide parameter.
     """
+    CLOSE = None
+    """Default close parameter.
+    """
 
-    def __init__(self, service, *, provide=None):
+    def __init__(self, service, *,
+                 name=None, depends=None, provide=None, close=None):
+        if name is None:
+            name = self.NAME
+        if depends is None:
+            depends = self.DEPENDS.copy()
         if provide is None:
             provide = self.PROVIDE
+        if close is None:
+            close = self.CLOSE
         self.__service = service
+        self.__name = name
+        self.__depends = depends
+        self.__duration = None
         # Override attributes
         if provide is not None:
             self.provide = provide
+        if close is not None:
+            self.close = close
 
     @asyncio.coroutine
     def __call__(self, service):
@@ -36,10 +96,16 @@ class Provider(Config):
         service: :class:`.Service`
             Service instance.
         """
-        return (yield from self.provide(service))
+        start = service.loop.time()
+        try:
+            return (yield from self.provide(service))
+        finally:
+            self.__duration = service.loop.time() - start
 
     def __repr__(self):
-        template = '<Provider provide="{self.provide}">'
+        template = (
+            '<Provider name="{self.name}" '
+            'depends="{self.depends}" provide="{self.provide}">')
         compiled = template.format(self=self)
         return compiled
 
@@ -49,6 +115,24 @@ class Provider(Config):
         """
         return self.__service
 
+    @property
+    def name(self):
+        """Provider's name (read-only).
+        """
+        return self.__name
+
+    @property
+    def depends(self):
+        """Names of providers to start before (read-only).
+        """
+        return self.__depends
+
+    @property
+    def duration(self):
+        """Start time in seconds or None if not started (read-only).
+        """
+        return self.__duration
+
     @asyncio.coroutine
     def provide(self, service):
         """Update the service.
@@ -59,3 +143,14 @@ class Provider(Config):
             Service instance.
         """
         raise NotImplementedError()
+
+    @asyncio.coroutine
+    def close(self, service):
+        """Release resources acquired by provide.
+
+        Parameters
+        ----------
+        service: :class:`.Service`
+            Service instance.
+        """
+        pass
@@ -17,8 +17,17 @@ class Pattern(metaclass=ABCMeta):
     def format(self, **match):
         pass  # pragma: no cover
 
+    @property
+    @abstractmethod
+    def prefix(self):
+        """Literal prefix of the pattern (read-only).
+        """
+        pass  # pragma: no cover
+
     @classmethod
     def create(cls, pattern, parsers):
+        if '<' not in pattern:
+            return StringPattern(pattern)
         matches = list(cls.__PARSER_PATTERN.finditer(pattern))
         if not matches:
             return StringPattern(pattern)
@@ -46,7 +55,8 @@ class Pattern(metaclass=ABCMeta):
         after = pattern[lastend:]
         cpattern += re.escape(after)
         template += after
-        return RegexPattern(cpattern, cparsers, template)
+        prefix = pattern[:matches[0].start()]
+        return RegexPattern(cpattern, cparsers, template, prefix)
 
     # Private
 
@@ -90,15 +100,20 @@ class StringPattern(Pattern):
     def format(self, **match):
         return self.__pattern
 
+    @property
+    def prefix(self):
+        return self.__pattern
+
 
 class RegexPattern(Pattern):
 
     # Public
 
-    def __init__(self, pattern, parsers, template):
+    def __init__(self, pattern, parsers, template, prefix=''):
         self.__pattern = pattern
         self.__parsers = parsers
         self.__template = template
+        self.__prefix = prefix
         try:
             self.__left = re.compile('^' + pattern)
             self.__full = re.compile('^' + pattern + '$')
@@ -113,14 +128,17 @@ class RegexPattern(Pattern):
         return compiled
 
     def match(self, string, left=False):
-        match = Match()
         pattern = self.__full
         if left:
             pattern = self.__left
         result = pattern.match(string)
         if not result:
             return None
-        for name, string in result.groupdict().items():
+        return self.convert(result.groupdict())
+
+    def convert(self, strings):
+        match = Match()
+        for name, string in strings.items():
             try:
                 value = self.__parsers[name].convert(string)
             except Exception:
@@ -128,7 +146,123 @@ class RegexPattern(Pattern):
             match[name] = value
         return match
 
+    def compose(self, tag):
+        names = '|'.join(map(re.escape, self.__parsers))
+        group = re.compile(r'\(\?P<({names})>'.format(names=names))
+        return group.sub(
+            lambda match: '(?P<' + tag + match.group(1) + '>',
+            self.__pattern)
+
     def format(self, **match):
         for name, value in match.items():
             match[name] = self.__parsers[name].restore(value)
         return self.__template.format_map(match)
+
+    @property
+    def prefix(self):
+        return self.__prefix
+
+    @property
+    def pattern(self):
+        """Regex source of the pattern (read-only).
+        """
+        return self.__pattern
+
+    @property
+    def parsers(self):
+        """Dict of placeholder parsers (read-only).
+        """
+        return self.__parsers
+
+    @property
+    def template(self):
+        """Format template of the pattern (read-only).
+        """
+        return self.__template
+
+
+class GroupPattern:
+    """Group of regex patterns matched by a single alternation regex.
+
+    Group returns index of the first pattern matching a string
+    and its match. Patterns before the index are known not to match.
+    Patterns after the index have to be matched on their own.
+    """
+
+    # Public
+
+    def __init__(self, patterns, left=False):
+        self.__patterns = patterns
+        self.__left = left
+        self.__regex = None
+        self.__branches = {}
+
+    def __repr__(self):
+        template = '<GroupPattern patterns={patterns} left={left}>'
+        compiled = template.format(
+            patterns=self.__patterns, left=self.__left)
+        return compiled
+
+    def __len__(self):
+        return len(self.__patterns)
+
+    def compile(self):
+        """Compile the alternation regex ahead of the first match.
+        """
+        self.__get_regex()
+
+    def match(self, string):
+        """Return (index, match) pair for the first matching pattern.
+
+        Index is None if no pattern matches. Match is None if pattern
+        matches the string but values conversion fails.
+        """
+        regex = self.__get_regex()
+        if regex is None:
+            for index, pattern in enumerate(self.__patterns):
+                match = pattern.match(string, left=self.__left)
+                if match:
+                    return (index, match)
+            return (None, None)
+        result = regex.match(string)
+        if not result:
+            return (None, None)
+        index, names = self.__branches[result.lastindex]
+        strings = {}
+        for group, name in names:
+            strings[name] = result.group(group)
+        return (index, self.__patterns[index].convert(strings))
+
+    # Private
+
+    __TAG_TEMPLATE = '_{index}_'
+    __BRANCH_TEMPLATE = '(?P<_{index}>{pattern}){end}'
+
+    def __get_regex(self):
+        if self.__regex is None:
+            branches = []
+            for index, pattern in enumerate(self.__patterns):
+                tag = self.__TAG_TEMPLATE.format(index=index)
+                branches.append(self.__BRANCH_TEMPLATE.format(
+                    index=index, pattern=pattern.compose(tag),
+                    end='' if self.__left else '$'))
+            try:
+                self.__regex = re.compile(
+                    '^(?:' + '|'.join(branches) + ')')
+            except (re.error, AssertionError):
+                # Too many groups for the Python version
+                self.__regex = False
+            else:
+                self.__add_branches(self.__regex)
+        return self.__regex or None
+
+    def __add_branches(self, regex):
+        names = {}
+        for group in regex.groupindex:
+            index, _, name = group[1:].partition('_')
+            names.setdefault(int(index), [])
+            if name:
+                names[int(index)].append((group, name))
+        for index in range(len(self.__patterns)):
+            number = regex.groupindex['_{index}'.format(index=index)]
+            self.__branches[number] = (index, names[index])
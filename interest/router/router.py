@@ -1,7 +1,12 @@
+import os
+import json
+import hashlib
 from urllib.parse import urlencode
-from ..helpers import Config, Match
+from ..helpers import Cache, Chain, Config, Match
 from .parser import StringParser, PathParser, IntegerParser, FloatParser
-from .pattern import Pattern
+from .pattern import Pattern, RegexPattern, GroupPattern
+from .table import Table
+from .tree import Tree
 
 
 class Router(Config):
@@ -13,6 +18,23 @@ class Router(Config):
     :class:`.Parser` dict to handle placeholders in paths.
     Builtin parsers are liste below.
 
+    On the first match router compiles all service's middleware paths
+    to the radix tree. For every request the tree is walked only once
+    to find the paths which could match. Other middlewares are rejected
+    without calling their patterns. Sibling regex paths sharing a literal
+    prefix are joined to the alternation regexes so a whole group
+    is matched by one regex call.
+    Paths unknown to the tree (e.g. passed by user code)
+    are matched directly. Their compiled patterns are kept
+    in the bounded LRU :attr:`.Router.cache`. Paths without placeholders
+    are never compiled to regexes or cached.
+
+    :meth:`.Service.listen` warms the router up so the tree
+    and all patterns are compiled before the first request.
+    With the snapshot parameter parsed patterns are dumped
+    to the JSON file and loaded from it on the next start
+    if the service's paths and parsers haven't changed.
+
     .. seealso:: Implements:
         :class:`.Config`
 
@@ -22,6 +44,10 @@ class Router(Config):
         Service instance.
     parsers: dict
         Dictionary of the :class:`.Parser` sublasses.
+    cache_size: int
+        Maximum number of compiled patterns to keep (None for unbounded).
+    snapshot: str
+        Path to the routes snapshot file (None to not use).
 
     Builtin parsers
     ---------------
@@ -44,14 +70,29 @@ class Router(Config):
     PARSERS = {}
     """Default parsers parameter.
     """
+    CACHE_SIZE = 1000
+    """Default cache_size parameter.
+    """
+    SNAPSHOT = None
+    """Default snapshot parameter.
+    """
 
-
-    def __init__(self, service, *, parsers=None):
+    def __init__(self, service, *,
+                 parsers=None, cache_size=None, snapshot=None):
         if parsers is None:
             parsers = self.PARSERS.copy()
+        if cache_size is None:
+            cache_size = self.CACHE_SIZE
+        if snapshot is None:
+            snapshot = self.SNAPSHOT
         self.__service = service
+        self.__snapshot = snapshot
         self.__add_parsers(parsers)
-        self.__patterns = {}
+        self.__patterns = Cache(cache_size)
+        self.__tree = None
+        self.__groups = {}
+        self.__tables = {}
+        self.__methods = {}
 
     @property
     def service(self):
@@ -59,6 +100,14 @@ class Router(Config):
         """
         return self.__service
 
+    @property
+    def cache(self):
+        """:class:`.Cache` of compiled patterns (read-only).
+
+        Cache exposes hits, misses and evictions counters.
+        """
+        return self.__patterns
+
     def match(self, request, *, root=None, path=None, methods=None):
         """Return match or None for the request/constraints pair.
 
@@ -77,21 +126,41 @@ class Router(Config):
         -------
         :class:`.Match`/None
             Match instance (True) or None (False).
+
+        .. note:: Results are memoized per request. Repeated calls
+            with the same constraints return the same :class:`.Match`.
         """
-        match = Match()
-        if path is not None:
-            pattern = self.__get_pattern(path)
-            match = pattern.match(request.path)
-        elif root is not None:
-            pattern = self.__get_pattern(root)
-            match = pattern.match(request.path, left=True)
-        if not match:
-            return None
-        if methods:
-            methods = map(str.upper, methods)
-            if request.method not in methods:
-                return None
-        return match
+        cache = self.__get_cache(request)
+        key = (root, path, tuple(methods or ()))
+        if key not in cache:
+            cache[key] = self.__match(
+                request, root=root, path=path, methods=key[2])
+        return cache[key]
+
+    def dispatch(self, request, *, over, path):
+        """Return methods table for the sibling endpoints bound to the path.
+
+        Table is compiled with the routing tree. It resolves
+        a request's method to the endpoint in one lookup.
+        Only endpoints of the same middleware are in the table
+        because others can't be reached by the chain.
+
+        Parameters
+        ----------
+        request: :class:`.http.Request`
+            Request instance.
+        over: :class:`.Middleware`
+            Middleware containing the endpoints.
+        path: str
+            HTTP path of the endpoints.
+
+        Returns
+        -------
+        :class:`.Table`/None
+            Table instance or None if no endpoints are bound to the path.
+        """
+        self.__get_tree()
+        return self.__tables.get((over, path))
 
     def url(self, name, *, base=None, query=None, **match):
         """Construct an url for the given parameters.
@@ -122,8 +191,98 @@ class Router(Config):
             url += '?' + urlencode(query)
         return url
 
+    def warm(self):
+        """Compile the routing tree and all patterns.
+
+        Patterns are loaded from the snapshot file if it's
+        up to date. Otherwise (or if the file is broken)
+        the snapshot file is written.
+        """
+        loaded = False
+        if self.__snapshot is not None:
+            try:
+                with open(self.__snapshot) as file:
+                    loaded = self.load(json.load(file))
+            except (OSError, ValueError,
+                    AttributeError, KeyError, TypeError):
+                # Broken snapshot is compiled again
+                pass
+        self.reset()
+        tree = self.__get_tree()
+        for _, full, left in self.__groups.values():
+            full.compile()
+            left.compile()
+        if self.__snapshot is not None and not loaded:
+            try:
+                self.__write_snapshot(self.dump())
+            except OSError as exception:
+                self.service.log('warning',
+                    'Routes snapshot is not written: {exception}'.
+                    format(exception=exception))
+        return tree
+
+    def dump(self):
+        """Return the routes snapshot.
+
+        Returns
+        -------
+        dict
+            JSON serializable snapshot with the patterns,
+            templates and parser names.
+        """
+        names = {parser: name for name, parser in self.__parsers.items()}
+        patterns = []
+        for path in self.__get_paths():
+            pattern = self.__get_pattern(path)
+            if not isinstance(pattern, RegexPattern):
+                continue
+            parsers = {key: names[parser]
+                       for key, parser in pattern.parsers.items()}
+            patterns.append([path, pattern.pattern,
+                parsers, pattern.template, pattern.prefix])
+        return {'key': self.__get_key(), 'patterns': patterns}
+
+    def load(self, snapshot):
+        """Load patterns from the routes snapshot.
+
+        Parameters
+        ----------
+        snapshot: dict
+            Snapshot returned by :meth:`.Router.dump`.
+
+        Returns
+        -------
+        bool
+            True if loaded, False if the snapshot is outdated.
+        """
+        if snapshot.get('key') != self.__get_key():
+            return False
+        # Nothing is loaded from a broken snapshot
+        patterns = {}
+        for path, pattern, parsers, template, prefix in snapshot['patterns']:
+            parsers = {key: self.__parsers[name]
+                       for key, name in parsers.items()}
+            patterns[path] = RegexPattern(
+                pattern, parsers, template, prefix)
+        for path, pattern in patterns.items():
+            self.__patterns[path] = pattern
+        return True
+
+    def reset(self):
+        """Reset the routing tree.
+
+        The tree will be compiled again from the service topology
+        on the next match. It's called by :meth:`.Service.reset`
+        on every topology change (push/pull).
+        """
+        self.__tree = None
+        self.__groups = {}
+        self.__tables = {}
+        self.__methods = {}
+
     # Private
 
+    __CACHE = '_{name}.cache'.format(name=__name__)
     __PARSERS = {
        'str': StringParser,
        'path': PathParser,
@@ -138,7 +297,134 @@ class Router(Config):
             self.__parsers[key] = cls(self)
 
     def __get_pattern(self, path):
-        if path not in self.__patterns:
-            self.__patterns[path] = Pattern.create(
-                path, self.__parsers)
-        return self.__patterns[path]
+        # Literal paths are cheap to create
+        if '<' not in path:
+            return Pattern.create(path, self.__parsers)
+        pattern = self.__patterns.get(path)
+        if pattern is None:
+            pattern = Pattern.create(path, self.__parsers)
+            self.__patterns[path] = pattern
+        return pattern
+
+    def __get_tree(self):
+        if self.__tree is None:
+            from ..endpoint import Endpoint
+            tree = Tree()
+            groups = {}
+            tables = {}
+            for middleware in self.__walk(self.service):
+                if middleware.service is not self.service:
+                    continue
+                path = middleware.path
+                tree.add(path, self.__get_pattern(path))
+                groups.update(self.__make_groups(middleware))
+                if isinstance(middleware, Endpoint):
+                    key = (middleware.over, path)
+                    tables.setdefault(key, Table()).add(middleware)
+            self.__tree = tree
+            self.__groups = groups
+            self.__tables = tables
+        return self.__tree
+
+    def __get_paths(self):
+        paths = []
+        for middleware in self.__walk(self.service):
+            if middleware.service is not self.service:
+                continue
+            paths.append(middleware.path)
+        return sorted(set(paths))
+
+    def __get_key(self):
+        parsers = {name: parser.pattern
+                   for name, parser in self.__parsers.items()}
+        source = json.dumps([self.__get_paths(), parsers], sort_keys=True)
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+    def __write_snapshot(self, snapshot):
+        # Replace the file atomically for concurrent starts
+        temppath = '{path}.{pid}'.format(
+            path=self.__snapshot, pid=os.getpid())
+        with open(temppath, 'w') as file:
+            json.dump(snapshot, file)
+        os.replace(temppath, self.__snapshot)
+
+    def __get_cache(self, request):
+        cache = getattr(request, self.__CACHE, None)
+        if cache is None:
+            cache = {}
+            setattr(request, self.__CACHE, cache)
+        return cache
+
+    def __make_groups(self, middleware):
+        # Siblings with different literal prefixes are told apart
+        # by the tree so only regex paths sharing a prefix are grouped
+        prefixes = {}
+        for submiddleware in middleware:
+            if not isinstance(submiddleware, Chain):
+                continue
+            if submiddleware.service is not self.service:
+                continue
+            path = submiddleware.path
+            pattern = self.__get_pattern(path)
+            if not isinstance(pattern, RegexPattern):
+                continue
+            paths = prefixes.setdefault(pattern.prefix, [])
+            if path not in paths:
+                paths.append(path)
+        groups = {}
+        for paths in prefixes.values():
+            if len(paths) < 2:
+                continue
+            patterns = [self.__get_pattern(path) for path in paths]
+            full = GroupPattern(patterns)
+            left = GroupPattern(patterns, left=True)
+            for index, path in enumerate(paths):
+                groups[path] = (index, full, left)
+        return groups
+
+    def __match(self, request, *, root, path, methods):
+        match = Match()
+        if path is not None:
+            match = self.__match_path(request, path)
+        elif root is not None:
+            match = self.__match_path(request, root, left=True)
+        if not match:
+            return None
+        if methods:
+            if request.method not in self.__get_methods(methods):
+                return None
+        return match
+
+    def __get_methods(self, methods):
+        if methods not in self.__methods:
+            self.__methods[methods] = frozenset(map(str.upper, methods))
+        return self.__methods[methods]
+
+    def __match_path(self, request, path, left=False):
+        tree = self.__get_tree()
+        if path in tree:
+            cache = self.__get_cache(request)
+            if tree not in cache:
+                cache[tree] = tree.lookup(request.path)
+            if path not in cache[tree]:
+                return None
+            if path in self.__groups:
+                index, full, lgroup = self.__groups[path]
+                group = lgroup if left else full
+                if group not in cache:
+                    cache[group] = group.match(request.path)
+                gindex, match = cache[group]
+                if gindex is None or index < gindex:
+                    return None
+                if index == gindex:
+                    return Match(match) if match is not None else None
+            pattern = tree[path]
+        else:
+            pattern = self.__get_pattern(path)
+        return pattern.match(request.path, left=left)
+
+    def __walk(self, middleware):
+        yield middleware
+        for submiddleware in middleware:
+            if isinstance(submiddleware, Chain):
+                yield from self.__walk(submiddleware)
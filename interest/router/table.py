@@ -0,0 +1,56 @@
+class Table:
+    """Methods table representation.
+
+    Table maps upper-cased HTTP methods to the endpoints bound
+    to the same path in the chain order. Endpoints without
+    methods constraint are mapped to any method.
+    """
+
+    # Public
+
+    def __init__(self):
+        self.__endpoints = {}
+        self.__order = {}
+        self.__any = []
+        self.__allow = frozenset()
+
+    def __repr__(self):
+        template = '<Table allow={allow}>'
+        compiled = template.format(allow=sorted(self.allow))
+        return compiled
+
+    @property
+    def allow(self):
+        """Frozen set of allowed methods (read-only).
+        """
+        return self.__allow
+
+    def add(self, endpoint):
+        """Add an endpoint to the table.
+        """
+        if endpoint in self.__order:
+            return
+        self.__order[endpoint] = len(self.__order)
+        methods = frozenset(map(str.upper, endpoint.methods))
+        if not methods:
+            self.__any.append(endpoint)
+        for method in methods:
+            self.__endpoints.setdefault(method, []).append(endpoint)
+        self.__allow = self.__allow | methods
+
+    def lookup(self, method, *, after=None):
+        """Return first endpoint allowing the method or None.
+
+        Parameters
+        ----------
+        method: str
+            Upper-cased HTTP method.
+        after: :class:`.Endpoint`
+            Return only endpoints following this one.
+        """
+        position = self.__order.get(after, -1)
+        for endpoints in (self.__endpoints.get(method, []), self.__any):
+            for endpoint in endpoints:
+                if self.__order[endpoint] > position:
+                    return endpoint
+        return None
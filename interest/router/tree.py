@@ -0,0 +1,99 @@
+class Tree:
+    """Radix tree representation.
+
+    Tree indexes paths by literal prefixes of their patterns. A lookup
+    walks a string only once and returns all paths which patterns could
+    match the string. Other paths are known not to match without
+    any regex call.
+    """
+
+    # Public
+
+    def __init__(self):
+        self.__root = Node()
+        self.__patterns = {}
+
+    def __repr__(self):
+        template = '<Tree paths={paths}>'
+        compiled = template.format(paths=list(self.__patterns))
+        return compiled
+
+    def __contains__(self, path):
+        return path in self.__patterns
+
+    def __getitem__(self, path):
+        return self.__patterns[path]
+
+    def __len__(self):
+        return len(self.__patterns)
+
+    def add(self, path, pattern):
+        """Add a path with the compiled pattern to the tree.
+        """
+        if path in self.__patterns:
+            return
+        self.__patterns[path] = pattern
+        self.__root.insert(pattern.prefix, path)
+
+    def lookup(self, string):
+        """Return set of paths which literal prefixes match the string.
+        """
+        return set(self.__root.lookup(string))
+
+
+class Node:
+    """Radix tree node representation.
+    """
+
+    # Public
+
+    def __init__(self, label=''):
+        self.label = label
+        self.paths = []
+        self.edges = {}
+
+    def __repr__(self):
+        template = '<Node label="{self.label}" paths={self.paths}>'
+        compiled = template.format(self=self)
+        return compiled
+
+    def insert(self, key, path):
+        node = self
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                edge = type(self)(key)
+                node.edges[key[0]] = edge
+            common = self.__common_length(edge.label, key)
+            if common < len(edge.label):
+                split = type(self)(edge.label[:common])
+                edge.label = edge.label[common:]
+                split.edges[edge.label[0]] = edge
+                node.edges[key[0]] = split
+                edge = split
+            node = edge
+            key = key[common:]
+        node.paths.append(path)
+
+    def lookup(self, string):
+        node = self
+        index = 0
+        yield from node.paths
+        while index < len(string):
+            edge = node.edges.get(string[index])
+            if edge is None or not string.startswith(edge.label, index):
+                break
+            node = edge
+            index += len(edge.label)
+            yield from node.paths
+
+    # Private
+
+    @staticmethod
+    def __common_length(string1, string2):
+        length = 0
+        for char1, char2 in zip(string1, string2):
+            if char1 != char2:
+                break
+            length += 1
+        return length
@@ -1,20 +1,27 @@
 import sys
+import signal
+import socket
 import asyncio
+from .executor import Executor
 from .logger import Logger
+from .metrics import Metrics
 from .handler import Handler
 from .helpers import loop
 from .router import Router
 from .middleware import Middleware
+from .supervisor import Supervisor
 
 
 class Service(Middleware):
     """Service is a middleware capable to listen on TCP/IP socket.
 
-    Service also provides methods :meth:`.Service.match`, :meth:`.Service.url`
-    and :meth:`.Service.log` to use in  request processing. This list can be
+    Service also provides methods :meth:`.Service.match`,
+    :meth:`.Service.dispatch`, :meth:`.Service.reset`, :meth:`.Service.url`,
+    :meth:`.Service.offload` and :meth:`.Service.log`
+    to use in  request processing. This list can be
     updated via :class:`.Provider` system. Concrete service functionality
-    is based on :class:`.Router`, :class:`.Logger`
-    and :class:`.Handler` classes.
+    is based on :class:`.Router`, :class:`.Logger`, :class:`.Handler`,
+    :class:`.Metrics`, :class:`.Executor` and :class:`.Supervisor` classes.
 
     .. seealso:: Implements:
         :class:`.Middleware`,
@@ -31,8 +38,15 @@ class Service(Middleware):
         :class:`.Logger` subclass.
     handler: type
         :class:`.Handler` subclass.
+    metrics: type
+        :class:`.Metrics` subclass.
+    executor: type
+        :class:`.Executor` subclass.
+    supervisor: type
+        :class:`.Supervisor` subclass.
     providers: list
-        List of :class:`.Provider` subclasses.
+        List of :class:`.Provider` subclasses (started concurrently
+        after their dependencies).
 
     Examples
     --------
@@ -65,6 +79,15 @@ class Service(Middleware):
     HANDLER = Handler
     """Default handler parameter.
     """
+    METRICS = Metrics
+    """Default metrics parameter.
+    """
+    EXECUTOR = Executor
+    """Default executor parameter.
+    """
+    SUPERVISOR = Supervisor
+    """Default supervisor parameter.
+    """
     PROVIDERS = []
     """Default providers parameter.
     """
@@ -73,6 +96,7 @@ class Service(Middleware):
                 name=None, prefix=None, methods=None,
                 middlewares=None, endpoint=None,
                 loop=None, router=None, logger=None, handler=None,
+                metrics=None, executor=None, supervisor=None,
                 providers=None):
         if loop is None:
             loop = self.LOOP
@@ -82,16 +106,29 @@ class Service(Middleware):
             logger = self.LOGGER
         if handler is None:
             handler = self.HANDLER
+        if metrics is None:
+            metrics = self.METRICS
+        if executor is None:
+            executor = self.EXECUTOR
+        if supervisor is None:
+            supervisor = self.SUPERVISOR
         if providers is None:
             providers = self.PROVIDERS.copy()
         service = self
+        # Endpoints require executor's pools on construction
+        self.__executor = executor(self)
+        # Topology changes reset router on construction
+        self.__router = router(self)
         super().__init__(service,
             name=name, prefix=prefix, methods=methods,
             middlewares=middlewares, endpoint=endpoint)
         self.__loop = loop
-        self.__router = router(self)
         self.__logger = logger(self)
         self.__handler = handler(self)
+        self.__metrics = metrics(self)
+        self.__supervisor = supervisor(self)
+        self.__providers = providers
+        self.__servers = []
         self.__apply_providers(providers)
 
     def __repr__(self):
@@ -106,36 +143,129 @@ class Service(Middleware):
     @property
     def loop(self):
         """asyncio's loop (read-only).
+
+        Mounted service uses the main service's loop.
         """
+        main = self.__get_main()
+        if main is not self:
+            return main.loop
         return self.__loop
 
-    def listen(self, *, host, port, override=False, forever=False, **kwargs):
+    @property
+    def metrics(self):
+        """:class:`.Metrics` instance (read-only).
+
+        Mounted service uses the main service's metrics.
+        """
+        main = self.__get_main()
+        if main is not self:
+            return main.metrics
+        return self.__metrics
+
+    @property
+    def executor(self):
+        """:class:`.Executor` instance (read-only).
+        """
+        return self.__executor
+
+    def listen(self, *, host, port,
+               override=False, forever=False, workers=None, **kwargs):
         """Listen on TCP/IP socket.
 
+        With workers parameter the service forks worker processes
+        supervised by :class:`.Supervisor` and blocks until shutdown.
+        Workers share the listening socket bound by the main process
+        or bind their own sockets if reuse_port=True is passed.
+        Providers (mounted services' providers too) are applied again
+        in every worker.
+        Routes (mounted services' routes too) are compiled
+        before listening (see :meth:`.Router.warm`).
+
         Parameters
         ----------
         host: str
             Host like '127.0.0.1'
         port:
             Port like 80.
+        workers: int
+            Number of worker processes.
         """
         if override:
             argv = dict(enumerate(sys.argv))
             host = argv.get(1, host)
             port = int(argv.get(2, port))
+        # Workers inherit compiled routes
+        for service in self.__get_services():
+            service.__router.warm()
+        if workers is not None:
+            sock = None
+            if not kwargs.get('reuse_port', False):
+                sock = self.__make_socket(host, port)
+                host = port = None
+            self.log('info',
+                'Start supervising workers="{workers}"'.
+                format(workers=workers))
+            self.__supervisor.run(
+                lambda: self.__listen_worker(host, port, sock, kwargs),
+                workers=workers)
+            return None
+        self.__start_executors()
         server = self.loop.create_server(
             self.__handler.fork, host, port, **kwargs)
         server = self.loop.run_until_complete(server)
+        self.__servers.append(server)
         self.log('info',
             'Start listening host="{host}" port="{port}"'.
             format(host=host, port=port))
         if forever:
+            self.loop.add_signal_handler(signal.SIGTERM, self.loop.stop)
             try:
                 self.loop.run_forever()
             except KeyboardInterrupt:
                 pass
+            self.loop.run_until_complete(self.shutdown())
         return server
 
+    @asyncio.coroutine
+    def shutdown(self, *, timeout=None):
+        """Shutdown the service gracefully (coroutine).
+
+        Service stops accepting connections, closes idle keep-alive
+        connections and waits up to the timeout for in-flight requests.
+        Then started providers are closed in reverse order
+        and executors are shut down (mounted services' ones too).
+        Listening forever service is shut down on SIGTERM
+        or KeyboardInterrupt.
+
+        .. seealso:: Proxy:
+            :meth:`.Handler.shutdown`
+
+        Parameters
+        ----------
+        timeout: int
+            Time to wait for in-flight requests in seconds.
+
+        Returns
+        -------
+        tuple
+            Numbers of drained and aborted requests.
+        """
+        for server in self.__servers:
+            server.close()
+        self.__servers = []
+        drained, aborted = yield from self.__handler.shutdown(
+            timeout=timeout)
+        # Mounted services' providers are started earlier
+        for service in self.__get_services():
+            yield from service.__close_providers()
+        for service in self.__get_services():
+            yield from service.__executor.close()
+        self.__logger.flush()
+        self.log('info',
+            'Stop listening drained="{drained}" aborted="{aborted}"'.
+            format(drained=drained, aborted=aborted))
+        return (drained, aborted)
+
     def match(self, request, *, root=None, path=None, methods=None):
         """Return match or None for the request/constraints pair.
 
@@ -145,6 +275,22 @@ class Service(Middleware):
         return self.__router.match(
             request, root=root, path=path, methods=methods)
 
+    def dispatch(self, request, *, over, path):
+        """Return methods table for the sibling endpoints bound to the path.
+
+        .. seealso:: Proxy:
+            :meth:`.Router.dispatch`
+        """
+        return self.__router.dispatch(request, over=over, path=path)
+
+    def reset(self):
+        """Reset compiled routes (called on topology changes).
+
+        .. seealso:: Proxy:
+            :meth:`.Router.reset`
+        """
+        self.__router.reset()
+
     def url(self, name, *, base=None, query=None, **match):
         """Construct an url for the given parameters.
 
@@ -153,6 +299,16 @@ class Service(Middleware):
         """
         return self.__router.url(name, base=base, query=query, **match)
 
+    @asyncio.coroutine
+    def offload(self, function, args=(), kwargs=None, *, kind='thread'):
+        """Run a synchronous function off the loop (coroutine).
+
+        .. seealso:: Proxy:
+            :meth:`.Executor.run`
+        """
+        return (yield from self.__executor.run(
+            function, args, kwargs, kind=kind))
+
     def log(self, level, *args, **kwargs):
         """Log something.
 
@@ -160,13 +316,146 @@ class Service(Middleware):
             :class:`.Logger`.level
         """
         target = getattr(self.__logger, level)
-        target(*args, **kwargs)
+        return target(*args, **kwargs)
 
     # Private
 
+    def __get_main(self):
+        main = self.main
+        if main is not self and isinstance(main, Service):
+            return main
+        return self
+
+    def __get_services(self):
+        # Service itself goes first then mounted services
+        services = []
+        stack = [self]
+        while stack:
+            middleware = stack.pop()
+            if isinstance(middleware, Service):
+                services.append(middleware)
+            stack.extend(reversed([item for item in middleware
+                                   if isinstance(item, Middleware)]))
+        return services
+
     def __apply_providers(self, providers):
+        self.__provided = []
+        if not providers:
+            return
+        providers = self.__sort_providers(
+            [provider(self) for provider in providers])
+        self.loop.run_until_complete(self.__start_providers(providers))
+
+    def __sort_providers(self, providers):
+        # Dependencies go first keeping the list's order otherwise
+        names = self.__name_providers(providers)
+        ordered = []
         for provider in providers:
-            if not asyncio.iscoroutine(provider):
-                provider = provider(self)
-            self.loop.run_until_complete(
-                provider(self))
+            self.__visit_provider(provider, names, ordered, [])
+        return ordered
+
+    def __visit_provider(self, provider, names, ordered, path):
+        if provider in ordered:
+            return
+        if provider in path:
+            raise ValueError(
+                'Cyclic provider dependency "{name}"'.
+                format(name=provider.name))
+        for name in provider.depends:
+            if name not in names:
+                raise ValueError(
+                    'Unknown provider dependency "{name}"'.
+                    format(name=name))
+            self.__visit_provider(
+                names[name], names, ordered, path + [provider])
+        ordered.append(provider)
+
+    def __name_providers(self, providers):
+        # Only names used as dependencies have to be unique
+        referenced = set()
+        for provider in providers:
+            referenced.update(provider.depends)
+        names = {}
+        for provider in providers:
+            if provider.name in names and provider.name in referenced:
+                raise ValueError(
+                    'Duplicate provider "{name}"'.
+                    format(name=provider.name))
+            names[provider.name] = provider
+        return names
+
+    @asyncio.coroutine
+    def __start_providers(self, providers):
+        names = self.__name_providers(providers)
+        tasks = {}
+        for provider in providers:
+            depends = [tasks[names[name]] for name in provider.depends]
+            tasks[provider] = self.loop.create_task(
+                self.__start_provider(provider, depends))
+        try:
+            yield from asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            yield from asyncio.gather(
+                *tasks.values(), return_exceptions=True)
+            raise
+
+    @asyncio.coroutine
+    def __start_provider(self, provider, depends):
+        for task in depends:
+            yield from task
+        yield from provider(self)
+        self.__provided.append(provider)
+        self.log('info',
+            'Start provider name="{name}" duration="{duration:.3f}"'.
+            format(name=provider.name, duration=provider.duration))
+
+    @asyncio.coroutine
+    def __close_providers(self):
+        # Dependants are started later so closed earlier
+        provided, self.__provided = self.__provided, []
+        for provider in reversed(provided):
+            try:
+                yield from provider.close(self)
+            except Exception:
+                self.log('exception',
+                    'Provider closing failed name="{name}"'.
+                    format(name=provider.name))
+
+    def __start_executors(self):
+        # Mounted services' endpoints use their own executors
+        for service in self.__get_services():
+            service.__executor.start()
+
+    def __make_socket(self, host, port):
+        family, socktype, proto, _, address = socket.getaddrinfo(
+            host, port, type=socket.SOCK_STREAM,
+            flags=socket.AI_PASSIVE)[0]
+        sock = socket.socket(family, socktype, proto)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(address)
+        sock.listen(100)
+        self.log('info',
+            'Start listening host="{host}" port="{port}"'.
+            format(host=host, port=port))
+        return sock
+
+    def __listen_worker(self, host, port, sock, kwargs):
+        # Forked process can't share the parent's loop
+        self.__loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.__loop)
+        # Mounted services are constructed before the main one
+        for service in reversed(self.__get_services()):
+            service.__apply_providers(service.__providers)
+        self.__start_executors()
+        if sock is not None:
+            kwargs = dict(kwargs, sock=sock)
+        server = self.loop.create_server(
+            self.__handler.fork, host, port, **kwargs)
+        server = self.loop.run_until_complete(server)
+        self.__servers.append(server)
+        for signum in [signal.SIGTERM, signal.SIGHUP]:
+            self.loop.add_signal_handler(signum, self.loop.stop)
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.shutdown())
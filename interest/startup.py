@@ -0,0 +1,101 @@
+"""Report import time of the interest package's attributes.
+
+Usage: python -m interest.startup [<name> ...]
+
+The package and then its attributes are loaded one by one in a fresh
+interpreter so every item's time includes only submodules not loaded
+before. Before Python 3.7 (no PEP 562) the package imports all
+attributes eagerly so the package item takes all the time.
+"""
+import os
+import sys
+import json
+import time
+import subprocess
+import interest
+
+
+def profile(names=None):
+    """Return import time breakdown of the package and its attributes.
+
+    Parameters
+    ----------
+    names: list
+        Attribute names (defaults to all public attributes).
+
+    Returns
+    -------
+    list
+        List of (name, seconds, modules) tuples where modules
+        are names of the modules imported for the item.
+        The first item is the package itself.
+    """
+    if names is None:
+        names = interest.__all__
+    # Package is imported by this module already
+    directory = os.path.dirname(os.path.dirname(interest.__file__))
+    path = os.environ.get('PYTHONPATH')
+    path = directory if not path else directory + os.pathsep + path
+    output = subprocess.check_output(
+        [sys.executable, '-c', _CODE, json.dumps(list(names))],
+        env=dict(os.environ, PYTHONPATH=path))
+    return [tuple(item) for item in json.loads(output.decode('utf-8'))]
+
+
+def measure(names):
+    """Return import time breakdown of the attributes in this process.
+    """
+    results = []
+    for name in names:
+        before = set(sys.modules)
+        start = time.perf_counter()
+        getattr(interest, name)
+        duration = time.perf_counter() - start
+        modules = sorted(set(sys.modules) - before)
+        results.append((name, duration, modules))
+    return results
+
+
+def report(results, *, file=None):
+    """Print import time breakdown returned by :func:`profile`.
+    """
+    if file is None:
+        file = sys.stdout
+    total = 0
+    for name, duration, modules in results:
+        total += duration
+        packages = sorted({module.split('.')[0] for module in modules})
+        print('{name:<12} {time:8.2f} ms {count:4} modules  {packages}'.
+            format(name=name, time=duration * 1000, count=len(modules),
+                   packages=' '.join(packages)), file=file)
+    print('{name:<12} {time:8.2f} ms'.
+        format(name='total', time=total * 1000), file=file)
+    if sys.version_info < (3, 7):
+        print('Attributes are imported eagerly by the package '
+              'before Python 3.7', file=file)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    report(profile(argv or None))
+
+
+# Private
+
+_CODE = '''
+import sys, json, time
+before = set(sys.modules)
+start = time.perf_counter()
+import interest
+duration = time.perf_counter() - start
+modules = sorted(set(sys.modules) - before)
+from interest.startup import measure
+results = [('interest', duration, modules)]
+results.extend(measure(json.loads(sys.argv[1])))
+print(json.dumps(results))
+'''
+
+
+if __name__ == '__main__':
+    main()
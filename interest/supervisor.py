@@ -0,0 +1,210 @@
+import os
+import time
+import signal
+import threading
+import traceback
+from .helpers import Config
+
+
+class Supervisor(Config):
+    """Supervisor is a component responsible for the worker processes.
+
+    Supervisor forks worker processes and keeps them running until
+    the supervisor gets SIGTERM or SIGINT. A crashed worker is forked again.
+    Workers failing quickly (e.g. on startup) are forked again
+    with a growing delay and supervisor gives up after
+    the maximum number of failures in a row. SIGTERM and SIGHUP
+    are forwarded to the workers. On SIGHUP workers exit gracefully
+    and are forked again at once (reload).
+    On shutdown the workers are killed if they are still running
+    after the shutdown timeout.
+
+    .. seealso:: Implements:
+        :class:`.Config`
+
+    Parameters
+    ----------
+    service: :class:`.Service`
+        Service instance.
+    shutdown_timeout: float
+        Time to wait for workers on shutdown in seconds.
+    restart_delay: float
+        Initial delay before forking a quickly failed worker in seconds
+        (it's doubled on every failure in a row).
+    max_restart_delay: float
+        Maximal restart delay in seconds. A worker running longer
+        is not counted as a quick failure.
+    max_failures: int
+        Maximum number of quick failures in a row to stop supervising.
+
+    Example
+    -------
+    Usually supervisor is used by :meth:`.Service.listen` with
+    workers parameter. But it could run any callable as a worker::
+
+        supervisor = Supervisor('<service>', shutdown_timeout=10)
+        supervisor.run('<worker>', workers=4)
+    """
+
+    # Public
+
+    SHUTDOWN_TIMEOUT = 30
+    """Time to wait for workers on shutdown in seconds (default).
+    """
+    RESTART_DELAY = 0.1
+    """Default restart_delay parameter.
+    """
+    MAX_RESTART_DELAY = 10
+    """Default max_restart_delay parameter.
+    """
+    MAX_FAILURES = 10
+    """Default max_failures parameter.
+    """
+
+    def __init__(self, service, *, shutdown_timeout=None,
+                 restart_delay=None, max_restart_delay=None,
+                 max_failures=None):
+        if shutdown_timeout is None:
+            shutdown_timeout = self.SHUTDOWN_TIMEOUT
+        if restart_delay is None:
+            restart_delay = self.RESTART_DELAY
+        if max_restart_delay is None:
+            max_restart_delay = self.MAX_RESTART_DELAY
+        if max_failures is None:
+            max_failures = self.MAX_FAILURES
+        self.__service = service
+        self.__shutdown_timeout = shutdown_timeout
+        self.__restart_delay = restart_delay
+        self.__max_restart_delay = max_restart_delay
+        self.__max_failures = max_failures
+        self.__worker = None
+        self.__pids = set()
+        self.__started = {}
+        self.__reloading = set()
+        self.__failures = 0
+        self.__stopping = False
+        self.__stopped = threading.Event()
+
+    @property
+    def service(self):
+        """:class:`.Service` instance (read-only).
+        """
+        return self.__service
+
+    @property
+    def pids(self):
+        """Set of running workers' process identifiers (read-only).
+        """
+        return frozenset(self.__pids)
+
+    def run(self, worker, *, workers):
+        """Run worker processes until shutdown.
+
+        Parameters
+        ----------
+        worker: callable
+            Callable to run in every worker process.
+        workers: int
+            Number of worker processes.
+        """
+        self.__worker = worker
+        self.__failures = 0
+        self.__stopping = False
+        self.__stopped.clear()
+        signal.signal(signal.SIGTERM, self.__handle_stop)
+        signal.signal(signal.SIGINT, self.__handle_stop)
+        signal.signal(signal.SIGHUP, self.__handle_reload)
+        signal.signal(signal.SIGALRM, self.__handle_timeout)
+        for _ in range(workers):
+            self.__spawn()
+        while self.__pids:
+            try:
+                pid, status = os.wait()
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+            self.__pids.discard(pid)
+            started = self.__started.pop(pid, None)
+            if pid in self.__reloading:
+                self.__reloading.discard(pid)
+                if not self.__stopping:
+                    self.__spawn()
+            elif not self.__stopping:
+                self.service.log('warning',
+                    'Worker exited pid="{pid}" status="{status}"'.
+                    format(pid=pid, status=status))
+                self.__respawn(started)
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        self.service.log('info', 'Stop supervising')
+
+    # Private
+
+    def __spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGHUP, signal.SIG_DFL)
+                signal.signal(signal.SIGALRM, signal.SIG_DFL)
+                self.__worker()
+            except Exception:
+                self.service.log('error', traceback.format_exc())
+                code = 1
+            finally:
+                os._exit(code)
+        self.__pids.add(pid)
+        self.__started[pid] = time.monotonic()
+        self.service.log('info',
+            'Start worker pid="{pid}"'.format(pid=pid))
+
+    def __respawn(self, started):
+        uptime = None
+        if started is not None:
+            uptime = time.monotonic() - started
+        if uptime is not None and uptime >= self.__max_restart_delay:
+            self.__failures = 0
+            self.__spawn()
+            return
+        self.__failures += 1
+        if self.__failures > self.__max_failures:
+            self.service.log('error',
+                'Stop supervising after "{failures}" worker failures'.
+                format(failures=self.__max_failures))
+            self.__stop()
+            return
+        delay = min(
+            self.__restart_delay * 2 ** (self.__failures - 1),
+            self.__max_restart_delay)
+        # Sleeping is resumed after signals (PEP 475) so stop
+        # handler sets the event to end waiting at once
+        self.__stopped.wait(delay)
+        if not self.__stopping:
+            self.__spawn()
+
+    def __signal(self, signum):
+        for pid in self.__pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def __stop(self):
+        if self.__stopping:
+            return
+        self.__stopping = True
+        self.__stopped.set()
+        self.__signal(signal.SIGTERM)
+        signal.setitimer(signal.ITIMER_REAL, self.__shutdown_timeout)
+
+    def __handle_stop(self, signum, frame):
+        self.__stop()
+
+    def __handle_reload(self, signum, frame):
+        self.__reloading.update(self.__pids)
+        self.__signal(signal.SIGHUP)
+
+    def __handle_timeout(self, signum, frame):
+        self.__signal(signal.SIGKILL)
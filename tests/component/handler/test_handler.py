@@ -25,6 +25,41 @@ class HandlerTest(unittest.TestCase):
         self.assertEqual(type(self.handler), type(fork))
         self.assertEqual(self.service, fork.service)
 
+    def test_limiter(self):
+        self.assertIsNone(self.handler.limiter)
+        handler = component.Handler(self.service, max_requests=10)
+        self.assertEqual(handler.limiter.limit, 10)
+        self.assertIs(handler.fork().limiter, handler.limiter)
+
+    def test_shutdown(self):
+        self.service.loop.time.return_value = 0
+        idle = self.handler.fork()
+        idle.connection_made(Mock())
+        transport = idle.transport
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        result = loop.run_until_complete(self.handler.shutdown())
+        self.assertEqual(result, (0, 0))
+        # Check idle connection is closed
+        transport.close.assert_called_with()
+
+    @patch.object(component.asyncio, 'sleep')
+    def test_shutdown_with_request(self, sleep):
+        sleep.side_effect = asyncio.coroutine(lambda *args, **kwargs: None)
+        self.service.loop.time.side_effect = [0, 0, 100]
+        busy = self.handler.fork()
+        busy.connection_made(Mock())
+        transport = busy.transport
+        busy._Handler__origin._Handler__requests.add(busy)
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        result = loop.run_until_complete(
+            self.handler.shutdown(timeout=10))
+        self.assertEqual(result, (0, 1))
+        # Check busy connection is aborted after timeout
+        self.assertEqual(sleep.call_count, 1)
+        transport.close.assert_called_with()
+
     @unittest.skip
     @patch.object(component.http, 'Request')
     def test_handle_request(self, Request):
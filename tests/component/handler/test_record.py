@@ -10,23 +10,28 @@ class RecordTest(unittest.TestCase):
 
     def setUp(self):
         self.addCleanup(patch.stopall)
-        self.request = Mock(headers={'key': 'value'})
-        self.response = Mock(headers={'key': 'value'})
-        self.atoms = patch.object(component, 'atoms').start()
-        self.atoms.return_value = {'h': 'host'}
+        self.request = Mock(
+            method='GET', path='/path', version=(1, 1),
+            headers={'key': 'value', 'USER-AGENT': 'agent'})
+        self.response = Mock(
+            status=200, output_length=10, headers={'key': 'value'})
+        self.transport = Mock()
+        self.transport.get_extra_info.return_value = ('host', 80)
         self.record = component.Record(
             request=self.request, response=self.response,
-            transport='transport', duration='duration')
+            transport=self.transport, duration=0.5)
 
     # Tests
 
-    def test(self):
-        # Check atoms call
-        self.atoms.assert_called_with(
-            self.request, None, self.response, 'transport', 'duration')
-
     def test_key_existent(self):
         self.assertEqual(self.record['host'], 'host')
+        self.assertEqual(self.record['request'], 'GET /path HTTP/1.1')
+        self.assertEqual(self.record['status'], '200')
+        self.assertEqual(self.record['length'], '10')
+        self.assertEqual(self.record['agent'], 'agent')
+        self.assertEqual(self.record['referer'], '-')
+        self.assertEqual(self.record['duration'], '500')
+        self.assertEqual(self.record['timing'], '-')
 
     def test_key_extended(self):
         self.assertEqual(self.record['<key:req>'], 'value')
@@ -34,3 +39,17 @@ class RecordTest(unittest.TestCase):
 
     def test_key_non_existent(self):
         self.assertEqual(self.record['non_existent'], '-')
+
+    def test_key_lazy(self):
+        self.assertEqual(dict(self.record), {})
+        self.record['host']
+        self.record['host']
+        self.assertEqual(dict(self.record), {'host': 'host'})
+        # Check item is computed once
+        self.assertEqual(self.transport.get_extra_info.call_count, 1)
+
+    def test_key_with_error(self):
+        self.transport.get_extra_info.return_value = None
+        self.assertEqual(self.record['host'], '-')
+        self.response.status = Mock(__str__=Mock(side_effect=RuntimeError))
+        self.assertEqual(self.record['status'], '-')
@@ -0,0 +1,47 @@
+import unittest
+from importlib import import_module
+component = import_module('interest.helpers.cache')
+
+
+class CacheTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.cache = component.Cache(2)
+
+    # Tests
+
+    def test_get(self):
+        self.cache['key'] = 'value'
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertIsNone(self.cache.get('missing'))
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_eviction(self):
+        self.cache['key1'] = 'value1'
+        self.cache['key2'] = 'value2'
+        self.cache.get('key1')
+        self.cache['key3'] = 'value3'
+        # Least recently used is evicted
+        self.assertIn('key1', self.cache)
+        self.assertNotIn('key2', self.cache)
+        self.assertIn('key3', self.cache)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_unbounded(self):
+        self.cache = component.Cache()
+        for index in range(100):
+            self.cache[index] = index
+        self.assertEqual(len(self.cache), 100)
+        self.assertEqual(self.cache.evictions, 0)
+
+    def test_delete_and_clear(self):
+        self.cache['key1'] = 'value1'
+        self.cache['key2'] = 'value2'
+        del self.cache['key1']
+        self.assertNotIn('key1', self.cache)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
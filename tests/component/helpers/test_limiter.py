@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from importlib import import_module
+component = import_module('interest.helpers.limiter')
+
+
+class LimiterTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    def acquire(self, limiter):
+        return self.loop.run_until_complete(limiter.acquire(loop=self.loop))
+
+    # Tests
+
+    def test_acquire(self):
+        limiter = component.Limiter(2)
+        self.assertTrue(self.acquire(limiter))
+        self.assertTrue(self.acquire(limiter))
+        self.assertFalse(self.acquire(limiter))
+        self.assertEqual(limiter.holders, 2)
+        self.assertEqual(limiter.rejected, 1)
+        limiter.release()
+        self.assertTrue(self.acquire(limiter))
+
+    def test_acquire_queue(self):
+        limiter = component.Limiter(1, queue_size=1)
+        self.assertTrue(self.acquire(limiter))
+        task = self.loop.create_task(limiter.acquire(loop=self.loop))
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.assertEqual(limiter.waiters, 1)
+        self.assertFalse(self.acquire(limiter))
+        limiter.release()
+        self.assertTrue(self.loop.run_until_complete(task))
+        self.assertEqual(limiter.holders, 1)
+        self.assertEqual(limiter.waiters, 0)
+
+    def test_acquire_queue_timeout(self):
+        limiter = component.Limiter(1, queue_size=1, queue_timeout=0.01)
+        self.assertTrue(self.acquire(limiter))
+        self.assertFalse(self.acquire(limiter))
+        self.assertEqual(limiter.waiters, 0)
+        self.assertEqual(limiter.rejected, 1)
+
+    def test_release_adaptive(self):
+        limiter = component.Limiter(10, latency=0.1, max_limit=11)
+        self.acquire(limiter)
+        limiter.release(1)
+        self.assertEqual(limiter.limit, 9)
+        for _ in range(20):
+            self.acquire(limiter)
+            limiter.release(0.01)
+        self.assertEqual(limiter.limit, 11)
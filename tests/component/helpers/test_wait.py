@@ -0,0 +1,49 @@
+import asyncio
+import unittest
+from importlib import import_module
+component = import_module('interest.helpers.wait')
+
+
+class WaitTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.cancelled = False
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    @asyncio.coroutine
+    def sleep(self, delay):
+        try:
+            yield from asyncio.sleep(delay, loop=self.loop)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return 'result'
+
+    def wait(self, coroutine, **kwargs):
+        return self.loop.run_until_complete(
+            component.wait(coroutine, loop=self.loop, **kwargs))
+
+    # Tests
+
+    def test_wait(self):
+        self.assertEqual(self.wait(self.sleep(0)), 'result')
+        self.assertEqual(self.wait(self.sleep(0), timeout=1), 'result')
+
+    def test_wait_timeout(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            self.wait(self.sleep(1), timeout=0.01)
+        self.assertTrue(self.cancelled)
+
+    def test_wait_task_cancelled(self):
+        task = self.loop.create_task(self.sleep(1))
+        self.loop.call_soon(task.cancel)
+        with self.assertRaises(asyncio.CancelledError):
+            self.wait(task, timeout=1)
+        self.assertTrue(self.cancelled)
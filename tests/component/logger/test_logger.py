@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, MagicMock, call, patch
 from importlib import import_module
 component = import_module('interest.logger.logger')
 
@@ -32,6 +32,74 @@ class LoggerTest(unittest.TestCase):
         self.system.info.assert_called_with(
             'host time "request" status length "referer" "agent"')
 
+    def test_access_buffered(self):
+        self.logger = component.Logger('service',
+            system=self.system, buffer_size=10, flush_interval=0)
+        record = self.make_mock_record_class()()
+        self.logger.access(record)
+        self.logger.flush()
+        # Check system.info call
+        self.system.info.assert_called_with(
+            'host time "request" status length "referer" "agent"')
+
+    def test_access_buffered_batch(self):
+        self.logger = component.Logger('service',
+            system=self.system, buffer_size=10, flush_size=2)
+        with patch.object(self.logger, '_Logger__get_queue') as get_queue:
+            get_queue.return_value = queue = component.Queue(10)
+            record = self.make_mock_record_class()()
+            self.logger.access(record)
+            self.logger.access(record)
+        thread = component.threading.Thread(
+            target=self.logger._Logger__write, args=(queue,), daemon=True)
+        thread.start()
+        queue.join()
+        # Check every record is written as a line
+        line = 'host time "request" status length "referer" "agent"'
+        self.assertEqual(
+            self.system.info.call_args_list, [call(line), call(line)])
+
+    @patch.object(component.threading, 'Thread')
+    def test_access_buffered_overflow_block(self, Thread):
+        service = Mock()
+        self.logger = component.Logger(service,
+            system=self.system, buffer_size=1, overflow='block')
+        record = self.make_mock_record_class()()
+        self.assertIsNone(self.logger.access(record))
+        waiter = self.logger.access(record)
+        # Check blocking put is run off the loop
+        self.assertIs(
+            waiter, service.loop.run_in_executor.return_value)
+        self.assertEqual(
+            service.loop.run_in_executor.call_args[0][0:2],
+            (None, self.logger._Logger__get_queue().put))
+
+    @patch.object(component.threading, 'Thread')
+    def test_access_buffered_overflow(self, Thread):
+        self.logger = component.Logger('service',
+            system=self.system, buffer_size=1)
+        record = self.make_mock_record_class()()
+        self.logger.access(record)
+        self.logger.access(record)
+        self.assertEqual(self.logger.dropped, 1)
+        self.assertFalse(self.system.info.called)
+
+    @patch.object(component.threading, 'Thread')
+    def test_access_buffered_loads_template_keys(self, Thread):
+        self.logger = component.Logger('service',
+            system=self.system, buffer_size=10,
+            template='%(request)s | %(<key:res>)s')
+        record = MagicMock()
+        self.logger.access(record)
+        # Check only template keys are loaded
+        self.assertEqual(
+            record.__getitem__.call_args_list,
+            [(('request',),), (('<key:res>',),)])
+
+    def test_overflow_unsupported(self):
+        self.assertRaises(ValueError,
+            component.Logger, 'service', overflow='unsupported')
+
     def test_debug(self):
         self.logger.debug('message', *self.args, **self.kwargs)
         # Check system.debug call
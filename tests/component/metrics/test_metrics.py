@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+component = import_module('interest.metrics.metrics')
+
+
+class MetricsTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.service = Mock()
+        self.service.over = self.service
+        self.service.loop.time.return_value = 0
+        self.middleware = Mock(over=self.service)
+        self.middleware.name = 'middleware'
+        self.endpoint = Mock(over=self.middleware)
+        self.endpoint.name = 'endpoint'
+        self.metrics = component.Metrics(self.service, buckets=[0.1, 1])
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    def record(self, duration, status):
+        start = self.metrics.begin(self.endpoint)
+        self.service.loop.time.return_value = duration
+        self.metrics.end(self.endpoint, start, status)
+        self.service.loop.time.return_value = 0
+
+    # Tests
+
+    def test_buckets(self):
+        self.assertEqual(self.metrics.buckets, [0.1, 1])
+
+    def test_path(self):
+        self.assertIsNone(self.metrics.path)
+        self.assertFalse(self.service.push.called)
+
+    def test_path_endpoint(self):
+        metrics = component.Metrics(self.service, path='/metrics')
+        self.assertEqual(metrics.path, '/metrics')
+        endpoint = self.service.push.call_args[0][0]
+        self.assertEqual(endpoint.path, '/metrics')
+        self.assertEqual(self.service.push.call_args[1], {'index': 0})
+
+    def test_expose(self):
+        self.record(0.05, 200)
+        self.record(0.5, 200)
+        self.record(5, 500)
+        text = self.metrics.expose()
+        labels = 'endpoint="middleware.endpoint"'
+        self.assertIn(
+            'interest_requests_total{%s} 3' % labels, text)
+        self.assertIn(
+            'interest_responses_total{%s,status="200"} 2' % labels, text)
+        self.assertIn(
+            'interest_responses_total{%s,status="500"} 1' % labels, text)
+        self.assertIn(
+            'interest_requests_in_flight{%s} 0' % labels, text)
+        self.assertIn(
+            'interest_request_duration_seconds_bucket'
+            '{%s,le="0.1"} 1' % labels, text)
+        self.assertIn(
+            'interest_request_duration_seconds_bucket'
+            '{%s,le="1"} 2' % labels, text)
+        self.assertIn(
+            'interest_request_duration_seconds_bucket'
+            '{%s,le="+Inf"} 3' % labels, text)
+        self.assertIn(
+            'interest_request_duration_seconds_sum{%s} 5.55' % labels, text)
+        self.assertIn(
+            'interest_request_duration_seconds_count{%s} 3' % labels, text)
+
+    def test_expose_in_flight(self):
+        self.metrics.begin(self.endpoint)
+        self.assertIn(
+            'interest_requests_in_flight'
+            '{endpoint="middleware.endpoint"} 1', self.metrics.expose())
+
+    def test_expose_empty(self):
+        text = self.metrics.expose()
+        self.assertIn('# TYPE interest_requests_total counter', text)
+        self.assertNotIn('endpoint=', text)
+
+    def test_profile(self):
+        self.assertFalse(self.metrics.profile)
+        metrics = component.Metrics(self.service, profile=True)
+        self.assertTrue(metrics.profile)
+
+    def test_measure(self):
+        request = Mock(spec=[])
+        response = Mock(headers={})
+        times = iter([0, 1, 3, 4])
+        self.service.loop.time.side_effect = lambda: next(times)
+        @asyncio.coroutine
+        def inner():
+            return response
+        @asyncio.coroutine
+        def outer():
+            return (yield from self.metrics.measure(
+                self.endpoint, request, inner()))
+        result = self.loop.run_until_complete(
+            self.metrics.measure(self.middleware, request, outer()))
+        self.assertEqual(result, response)
+        self.assertEqual(self.metrics.trace(request), [
+            ('middleware.endpoint', 2, 2),
+            ('middleware', 4, 2)])
+        self.assertEqual(response.headers['SERVER-TIMING'],
+            'middleware.endpoint;dur=2000.000;desc="self=2000.000", '
+            'middleware;dur=4000.000;desc="self=2000.000"')
+
+    def test_trace_empty(self):
+        self.assertEqual(self.metrics.trace(Mock(spec=[])), [])
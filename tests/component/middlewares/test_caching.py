@@ -0,0 +1,158 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+from interest import Endpoint, Middleware, http
+from interest.middlewares import Compression
+component = import_module('interest.middlewares.caching')
+
+
+class CachingTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.addCleanup(asyncio.set_event_loop, asyncio.get_event_loop())
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.time = Mock(return_value=0)
+        self.service = Mock(loop=self.loop)
+        self.calls = 0
+        self.headers = {}
+        self.caching = component.Caching(self.service, ttl=10)
+        self.caching.next = self.respond
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    @asyncio.coroutine
+    def respond(self, request):
+        self.calls += 1
+        yield from asyncio.sleep(0, loop=self.loop)
+        return http.Response(text='text', headers=self.headers)
+
+    def make_request(self, method='GET', path='/path', headers=None):
+        return Mock(method=method, path_qs=path, headers=headers or {})
+
+    def process(self, *requests):
+        coroutines = [self.caching.process(request) for request in requests]
+        return self.loop.run_until_complete(
+            asyncio.gather(*coroutines, loop=self.loop))
+
+    # Tests
+
+    def test_process(self):
+        first, = self.process(self.make_request())
+        second, = self.process(self.make_request())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second.body, first.body)
+        self.assertIsNot(second, first)
+        self.assertEqual(self.caching.cache.hits, 1)
+
+    def test_process_key(self):
+        self.process(self.make_request(path='/path1'))
+        self.process(self.make_request(path='/path2'))
+        self.assertEqual(self.calls, 2)
+
+    def test_process_expired(self):
+        self.process(self.make_request())
+        self.loop.time.return_value = 10
+        self.process(self.make_request())
+        self.assertEqual(self.calls, 2)
+
+    def test_process_method_not_cached(self):
+        self.process(self.make_request(method='POST'))
+        self.process(self.make_request(method='POST'))
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(len(self.caching.cache), 0)
+
+    def test_process_coalesced(self):
+        responses = self.process(*[self.make_request() for _ in range(5)])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(responses), 5)
+
+    def test_process_error_not_cached(self):
+        @asyncio.coroutine
+        def respond(request):
+            self.calls += 1
+            raise http.NotFound()
+        self.caching.next = respond
+        for _ in range(2):
+            with self.assertRaises(http.NotFound):
+                self.process(self.make_request())
+        self.assertEqual(self.calls, 2)
+
+    def test_process_endpoint_ttl(self):
+        parent = Middleware(self.service)
+        parent.push(self.caching)
+        parent.push(Endpoint(self.service,
+            prefix='/path', methods=['GET'], ttl=0))
+        self.caching.next = self.respond
+        self.process(self.make_request())
+        self.process(self.make_request())
+        self.assertEqual(self.calls, 2)
+
+    def test_process_authorization_not_cached(self):
+        headers = {'AUTHORIZATION': 'Basic dXNlcjpwYXNz'}
+        self.process(self.make_request(headers=headers))
+        self.process(self.make_request(headers=headers))
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(len(self.caching.cache), 0)
+
+    def test_process_set_cookie_not_cached(self):
+        self.headers = {'SET-COOKIE': 'session=secret'}
+        self.process(self.make_request())
+        self.process(self.make_request())
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(len(self.caching.cache), 0)
+
+    def test_process_cache_control_private_not_cached(self):
+        for control in ['private', 'no-store', 'max-age=60, No-Cache']:
+            self.headers = {'CACHE-CONTROL': control}
+            self.process(self.make_request(path=control))
+            self.process(self.make_request(path=control))
+        self.assertEqual(self.calls, 6)
+        self.assertEqual(len(self.caching.cache), 0)
+
+    def test_process_cache_control_public_cached(self):
+        self.headers = {'CACHE-CONTROL': 'public, max-age=60'}
+        self.process(self.make_request())
+        self.process(self.make_request())
+        self.assertEqual(self.calls, 1)
+
+    def test_process_vary_not_cached(self):
+        self.headers = {'VARY': 'Accept-Encoding'}
+        self.process(self.make_request())
+        self.process(self.make_request())
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(len(self.caching.cache), 0)
+
+    def test_process_compression(self):
+        self.headers = {'CONTENT-TYPE': 'text/plain'}
+        compression = Compression(self.service, min_length=1)
+        compression.next = self.respond
+        self.caching.next = compression.process
+        gzip = {'ACCEPT-ENCODING': 'gzip'}
+        first, = self.process(self.make_request(headers=gzip))
+        second, = self.process(self.make_request())
+        # Compressed body isn't served to a plain client
+        self.assertEqual(first.headers['CONTENT-ENCODING'], 'gzip')
+        self.assertNotIn('CONTENT-ENCODING', second.headers)
+        self.assertEqual(second.body, b'text')
+
+    def test_process_compression_key(self):
+        self.headers = {'CONTENT-TYPE': 'text/plain'}
+        self.caching = component.Caching(
+            self.service, ttl=10, headers=['ACCEPT-ENCODING'])
+        compression = Compression(self.service, min_length=1)
+        compression.next = self.respond
+        self.caching.next = compression.process
+        gzip = {'ACCEPT-ENCODING': 'gzip'}
+        self.process(self.make_request(headers=gzip))
+        self.process(self.make_request(headers=gzip))
+        second, = self.process(self.make_request())
+        # Varying responses are cached by the key headers
+        self.assertEqual(self.calls, 2)
+        self.assertNotIn('CONTENT-ENCODING', second.headers)
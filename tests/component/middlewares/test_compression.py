@@ -0,0 +1,98 @@
+import zlib
+import asyncio
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+from interest import http
+component = import_module('interest.middlewares.compression')
+
+
+class CompressionTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.service = Mock(loop=self.loop)
+        self.body = b'text' * 1000
+        self.response = http.Response(
+            body=self.body, headers={'CONTENT-TYPE': 'text/plain'})
+        self.compression = component.Compression(
+            self.service, min_length=100, thread_length=10000)
+        self.compression.next = self.respond
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    @asyncio.coroutine
+    def respond(self, request):
+        return self.response
+
+    def process(self, encoding=None):
+        headers = {}
+        if encoding is not None:
+            headers['ACCEPT-ENCODING'] = encoding
+        request = Mock(headers=headers)
+        return self.loop.run_until_complete(
+            self.compression.process(request))
+
+    # Tests
+
+    def test_process_gzip(self):
+        response = self.process('gzip, deflate')
+        self.assertEqual(response.headers['CONTENT-ENCODING'], 'gzip')
+        self.assertEqual(response.headers['VARY'], 'Accept-Encoding')
+        self.assertEqual(
+            zlib.decompress(response.body, 16 + zlib.MAX_WBITS), self.body)
+
+    def test_process_deflate(self):
+        response = self.process('gzip;q=0.5, deflate')
+        self.assertEqual(response.headers['CONTENT-ENCODING'], 'deflate')
+        self.assertEqual(zlib.decompress(response.body), self.body)
+
+    def test_process_not_accepted(self):
+        for encoding in [None, 'identity', 'gzip;q=0, br']:
+            response = self.process(encoding)
+            self.assertNotIn('CONTENT-ENCODING', response.headers)
+            self.assertEqual(response.body, self.body)
+
+    def test_process_min_length(self):
+        self.response.body = b'text'
+        response = self.process('gzip')
+        self.assertNotIn('CONTENT-ENCODING', response.headers)
+
+    def test_process_type(self):
+        self.response.headers['CONTENT-TYPE'] = 'image/png'
+        response = self.process('gzip')
+        self.assertNotIn('CONTENT-ENCODING', response.headers)
+
+    def test_process_thread(self):
+        self.response.body = self.body = b'text' * 10000
+        response = self.process('gzip')
+        self.assertEqual(
+            zlib.decompress(response.body, 16 + zlib.MAX_WBITS), self.body)
+
+    def test_process_etag(self):
+        self.response.headers['ETAG'] = '"etag"'
+        response = self.process('gzip')
+        self.assertEqual(response.headers['ETAG'], 'W/"etag"')
+
+    def test_process_stream(self):
+        self.response = Mock(spec=http.StreamResponse,
+            status=200, started=False,
+            headers={'CONTENT-TYPE': 'application/json'})
+        self.response.enable_compression = Mock()
+        response = self.process('gzip, deflate')
+        response.enable_compression.assert_called_with()
+
+    def test_process_stream_deflate_not_accepted(self):
+        self.response = Mock(spec=http.StreamResponse,
+            status=200, started=False,
+            headers={'CONTENT-TYPE': 'application/json'})
+        self.response.enable_compression = Mock()
+        response = self.process('gzip')
+        # Streaming compression would deflate so it's skipped
+        self.assertFalse(response.enable_compression.called)
+        self.assertNotIn('VARY', response.headers)
@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+from interest import Endpoint, Match, Middleware, http
+component = import_module('interest.middlewares.conditional')
+
+
+class ConditionalTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.service = Mock(loop=self.loop)
+        self.service.match.return_value = Match()
+        self.response = http.Response(text='text')
+        self.conditional = component.Conditional(self.service)
+        self.conditional.next = self.respond
+        self.calls = 0
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    @asyncio.coroutine
+    def respond(self, request):
+        self.calls += 1
+        return self.response
+
+    def make_request(self, method='GET', **headers):
+        return Mock(method=method, headers=headers)
+
+    def process(self, request):
+        return self.loop.run_until_complete(
+            self.conditional.process(request))
+
+    # Tests
+
+    def test_process(self):
+        response = self.process(self.make_request())
+        self.assertEqual(response, self.response)
+        self.assertEqual(response.headers['ETAG'],
+            '"{hash}"'.format(hash=hashlib.sha1(b'text').hexdigest()))
+
+    def test_process_not_modified(self):
+        etag = self.process(self.make_request()).headers['ETAG']
+        with self.assertRaises(http.NotModified):
+            self.process(self.make_request(**{'IF-NONE-MATCH': etag}))
+
+    def test_process_not_modified_weak(self):
+        etag = self.process(self.make_request()).headers['ETAG']
+        with self.assertRaises(http.NotModified):
+            self.process(self.make_request(
+                **{'IF-NONE-MATCH': '"other", W/' + etag}))
+
+    def test_process_modified(self):
+        response = self.process(
+            self.make_request(**{'IF-NONE-MATCH': '"other"'}))
+        self.assertEqual(response, self.response)
+
+    def test_process_response_etag(self):
+        self.response.headers['ETAG'] = '"etag"'
+        with self.assertRaises(http.NotModified):
+            self.process(self.make_request(**{'IF-NONE-MATCH': '"etag"'}))
+
+    def test_process_last_modified(self):
+        self.response.headers['LAST-MODIFIED'] = (
+            'Sun, 06 Nov 1994 08:49:37 GMT')
+        with self.assertRaises(http.NotModified):
+            self.process(self.make_request(
+                **{'IF-MODIFIED-SINCE': 'Sun, 06 Nov 1994 08:49:37 GMT'}))
+        response = self.process(self.make_request(
+            **{'IF-MODIFIED-SINCE': 'Sat, 05 Nov 1994 08:49:37 GMT'}))
+        self.assertEqual(response, self.response)
+
+    def test_process_method(self):
+        response = self.process(self.make_request(method='POST'))
+        self.assertNotIn('ETAG', response.headers)
+
+    def test_process_validator(self):
+        parent = Middleware(self.service)
+        parent.push(self.conditional)
+        parent.push(Endpoint(self.service,
+            prefix='/path', methods=['GET'],
+            validator=lambda request: '"version"'))
+        self.conditional.next = self.respond
+        with self.assertRaises(http.NotModified):
+            self.process(self.make_request(**{'IF-NONE-MATCH': '"version"'}))
+        self.assertEqual(self.calls, 0)
+        response = self.process(self.make_request())
+        self.assertEqual(response.headers['ETAG'], '"version"')
+        self.assertEqual(self.calls, 1)
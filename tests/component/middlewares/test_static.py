@@ -0,0 +1,108 @@
+import os
+import socket
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+from interest import http
+component = import_module('interest.middlewares.static')
+
+
+class StaticTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.write('small.txt', b'0123456789')
+        self.write('large.bin', b'x' * 100)
+        self.service = Mock(loop=self.loop)
+        self.static = component.Static(self.service,
+            prefix='/static', root=self.directory.name,
+            max_cache_length=50, chunk_size=30)
+        self.static.next = self.respond
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    def write(self, name, data):
+        with open(os.path.join(self.directory.name, name), 'wb') as file:
+            file.write(data)
+
+    @asyncio.coroutine
+    def respond(self, request):
+        return 'next'
+
+    def process(self, path, method='GET', transport=None, **headers):
+        if transport is None:
+            transport = Mock()
+            transport.get_extra_info.return_value = None
+        request = Mock(
+            method=method, path=path, headers=headers, transport=transport)
+        return self.loop.run_until_complete(self.static.process(request))
+
+    # Tests
+
+    def test_process_small(self):
+        response = self.process('/static/small.txt')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.body, b'0123456789')
+        self.assertEqual(response.headers['CONTENT-TYPE'], 'text/plain')
+        self.assertEqual(response.headers['ACCEPT-RANGES'], 'bytes')
+        self.assertEqual(len(self.static.cache), 1)
+
+    def test_process_range(self):
+        response = self.process('/static/small.txt', RANGE='bytes=2-4')
+        self.assertEqual(response.status, 206)
+        self.assertEqual(response.body, b'234')
+        self.assertEqual(response.headers['CONTENT-RANGE'], 'bytes 2-4/10')
+        response = self.process('/static/small.txt', RANGE='bytes=-3')
+        self.assertEqual(response.body, b'789')
+
+    def test_process_range_not_satisfiable(self):
+        with self.assertRaises(http.RequestRangeNotSatisfiable):
+            self.process('/static/small.txt', RANGE='bytes=20-30')
+
+    def test_process_not_modified(self):
+        etag = self.process('/static/small.txt').headers['ETAG']
+        with self.assertRaises(http.NotModified):
+            self.process('/static/small.txt', **{'IF-NONE-MATCH': etag})
+
+    def test_process_head(self):
+        response = self.process('/static/small.txt', method='HEAD')
+        self.assertEqual(response.body, b'')
+        self.assertEqual(response.headers['CONTENT-LENGTH'], '10')
+
+    def test_process_next(self):
+        self.assertEqual(self.process('/static/missing.txt'), 'next')
+        self.assertEqual(self.process('/static/../secret'), 'next')
+        self.assertEqual(self.process('/static/'), 'next')
+        self.assertEqual(self.process('/static/small.txt', 'POST'), 'next')
+
+    def test_process_chunked(self):
+        response = self.process('/static/large.bin')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers['CONTENT-LENGTH'], '100')
+        self.assertEqual(response._body, b'x' * 100)
+
+    def test_process_sendfile(self):
+        if not hasattr(os, 'sendfile'):
+            self.skipTest('os.sendfile is not available')
+        server, client = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+        server.setblocking(False)
+        transport = Mock()
+        transport.get_extra_info.side_effect = {
+            'socket': server, 'sslcontext': None}.get
+        transport.get_write_buffer_size.return_value = 0
+        response = self.process('/static/large.bin',
+            transport=transport, RANGE='bytes=10-')
+        self.assertEqual(response.status, 206)
+        self.assertEqual(client.recv(1000), b'x' * 90)
+        self.assertEqual(response._body, b'')
@@ -0,0 +1,141 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+from interest import http
+component = import_module('interest.middlewares.throttling')
+
+
+class ThrottlingTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop.time = Mock(return_value=100)
+        self.service = Mock(loop=self.loop)
+        self.throttling = component.Throttling(self.service, rate=2)
+        self.throttling.next = self.respond
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    @asyncio.coroutine
+    def respond(self, request):
+        return 'response'
+
+    def process(self, host='host'):
+        request = Mock()
+        request.transport.get_extra_info.return_value = (host, 80)
+        return self.loop.run_until_complete(
+            self.throttling.process(request))
+
+    # Tests
+
+    def test_process(self):
+        self.assertEqual(self.process(), 'response')
+        self.assertEqual(self.process(), 'response')
+        with self.assertRaises(http.TooManyRequests) as context:
+            self.process()
+        self.assertEqual(context.exception.status, 429)
+        self.assertEqual(context.exception.headers['RETRY-AFTER'], '1')
+        # Other key
+        self.assertEqual(self.process('other'), 'response')
+        # Refilled
+        self.loop.time.return_value = 100.5
+        self.assertEqual(self.process(), 'response')
+
+    def test_process_key(self):
+        self.throttling = component.Throttling(self.service,
+            rate=1, key=lambda request: None)
+        self.throttling.next = self.respond
+        for _ in range(3):
+            self.assertEqual(self.process(), 'response')
+
+    def test_process_window(self):
+        self.throttling = component.Throttling(self.service,
+            rate=2, period=10, algorithm='window')
+        self.throttling.next = self.respond
+        self.process()
+        self.process()
+        with self.assertRaises(http.TooManyRequests) as context:
+            self.process()
+        self.assertEqual(context.exception.headers['RETRY-AFTER'], '10')
+
+    def test_algorithm_invalid(self):
+        with self.assertRaises(ValueError):
+            component.Throttling(self.service, algorithm='invalid')
+
+
+class StoreTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop.time = Mock(return_value=0)
+        self.service = Mock(loop=self.loop)
+        self.store = component.Store(self.service, shards=4, sweep_interval=1)
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Helpers
+
+    def take(self, key='key'):
+        return self.loop.run_until_complete(
+            self.store.take(key, rate=1, burst=2))
+
+    def count(self, key='key'):
+        return self.loop.run_until_complete(
+            self.store.count(key, limit=2, window=10))
+
+    # Tests
+
+    def test_take(self):
+        self.assertEqual(self.take(), 0)
+        self.assertEqual(self.take(), 0)
+        self.assertEqual(self.take(), 1)
+        self.loop.time.return_value = 0.5
+        self.assertEqual(self.take(), 0.5)
+        self.loop.time.return_value = 1
+        self.assertEqual(self.take(), 0)
+
+    def test_count(self):
+        self.assertEqual(self.count(), 0)
+        self.assertEqual(self.count(), 0)
+        self.assertEqual(self.count(), 10)
+        # Previous window is weighted
+        self.loop.time.return_value = 15
+        self.assertEqual(self.count(), 0)
+        self.assertEqual(self.count(), 5)
+        self.loop.time.return_value = 20
+        self.assertEqual(self.count(), 0)
+
+    def test_count_float_window(self):
+        for now, later in [(0.25, 0.35), (0.65, 0.75), (2.25, 2.35)]:
+            self.loop.time.return_value = now
+            for _ in range(2):
+                self.loop.run_until_complete(
+                    self.store.count(now, limit=2, window=0.1))
+            # Previous window is found in spite of float rounding
+            self.loop.time.return_value = later
+            wait = self.loop.run_until_complete(
+                self.store.count(now, limit=2, window=0.1))
+            self.assertGreater(wait, 0)
+
+    def test_sweep(self):
+        self.store = component.Store(self.service, shards=1, sweep_interval=1)
+        self.take('key1')
+        self.take('key2')
+        self.assertEqual(len(self.store), 2)
+        self.loop.time.return_value = 10
+        self.take('key1')
+        self.take('key2')
+        self.assertEqual(len(self.store), 2)
+        self.loop.time.return_value = 20
+        for index in range(8):
+            self.take('key{index}'.format(index=index + 3))
+        self.assertEqual(len(self.store), 8)
@@ -46,3 +46,27 @@ class PatternTest(unittest.TestCase):
             self.assertEqual(
                 pattern.match(string, left),
                 match, (pattern, fixture))
+
+    def test_prefix(self):
+        pattern = component.Pattern.create('/test', self.parsers)
+        self.assertEqual(pattern.prefix, '/test')
+        pattern = component.Pattern.create('/test/<key:int>', self.parsers)
+        self.assertEqual(pattern.prefix, '/test/')
+
+    def test_group(self):
+        paths = ['/<key:int>', '/<key:int>/edit', '/<key>', '/<a:int>/<b:int>']
+        patterns = [component.Pattern.create(path, self.parsers)
+                    for path in paths]
+        group = component.GroupPattern(patterns)
+        self.assertEqual(len(group), 4)
+        self.assertEqual(group.match('/5'), (0, {'key': 5}))
+        self.assertEqual(group.match('/5/edit'), (1, {'key': 5}))
+        self.assertEqual(group.match('/value'), (2, {'key': 'value'}))
+        self.assertEqual(group.match('/<>/<>'), (None, None))
+
+    def test_group_left(self):
+        paths = ['/<key:int>/edit', '/<key>']
+        patterns = [component.Pattern.create(path, self.parsers)
+                    for path in paths]
+        group = component.GroupPattern(patterns, left=True)
+        self.assertEqual(group.match('/value/edit'), (1, {'key': 'value'}))
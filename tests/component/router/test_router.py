@@ -0,0 +1,239 @@
+import os
+import json
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from importlib import import_module
+from interest import Service, Middleware, Endpoint, http
+component = import_module('interest.router.router')
+
+
+class RouterTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.service = MagicMock()
+        self.router = component.Router(self.service)
+
+    # Helpers
+
+    def make_request(self, method='GET', path='/path/1'):
+        return SimpleNamespace(method=method, path=path)
+
+    # Tests
+
+    def test_service(self):
+        self.assertEqual(self.router.service, self.service)
+
+    def test_match(self):
+        request = self.make_request()
+        self.assertEqual(
+            self.router.match(request, path='/path/<key:int>'), {'key': 1})
+        self.assertEqual(
+            self.router.match(request, root='/path'), {})
+        self.assertIsNone(
+            self.router.match(request, root='/other'))
+
+    def test_match_methods(self):
+        request = self.make_request()
+        self.assertTrue(self.router.match(request, methods=['get']))
+        self.assertIsNone(self.router.match(request, methods=['POST']))
+
+    def test_match_memoized(self):
+        request = self.make_request()
+        original = component.RegexPattern.match
+        with patch.object(component.RegexPattern, 'match',
+                          autospec=True, side_effect=original) as match:
+            match1 = self.router.match(request, path='/path/<key:int>')
+            match2 = self.router.match(request, path='/path/<key:int>')
+        self.assertIs(match1, match2)
+        self.assertEqual(match.call_count, 1)
+        # Other request is matched again
+        match3 = self.router.match(
+            self.make_request(), path='/path/<key:int>')
+        self.assertIsNot(match1, match3)
+        self.assertEqual(match1, match3)
+
+    def test_cache(self):
+        self.router = component.Router(self.service, cache_size=2)
+        for key in range(3):
+            self.router.match(
+                self.make_request(), path='/path/<key:int>/' + str(key))
+        self.router.match(self.make_request(), path='/path/<key:int>/2')
+        self.assertEqual(len(self.router.cache), 2)
+        self.assertEqual(self.router.cache.hits, 1)
+        self.assertEqual(self.router.cache.misses, 3)
+        self.assertEqual(self.router.cache.evictions, 1)
+
+    def test_cache_literal_path(self):
+        request = self.make_request()
+        self.assertTrue(self.router.match(request, path=request.path))
+        self.assertEqual(len(self.router.cache), 0)
+        self.assertEqual(self.router.cache.misses, 0)
+
+
+    def test_groups_split_by_prefix(self):
+        service = Service(middlewares=[Mixed])
+        router = component.Router(service)
+        original = component.GroupPattern
+        with patch.object(component, 'GroupPattern',
+                          side_effect=original) as group:
+            router.warm()
+        # Only siblings sharing a literal prefix are grouped
+        prefixes = {pattern.prefix
+                    for call in group.call_args_list
+                    for pattern in call[0][0]}
+        self.assertEqual(prefixes, {'/items/'})
+        request = self.make_request(path='/users/2')
+        self.assertEqual(
+            router.match(request, path='/users/<key:int>'), {'key': 2})
+        self.assertIsNone(
+            router.match(request, path='/items/<key:int>'))
+
+    def test_dispatch_per_middleware(self):
+        service = Service(middlewares=[
+            Middleware.config(name='first', middlewares=[Resource]),
+            Middleware.config(name='second', prefix='/resource')])
+        service['second'].push(Endpoint(service, name='any'))
+        router = component.Router(service)
+        request = self.make_request(method='POST', path='/resource')
+        first = router.dispatch(
+            request, over=service['first']['resource'], path='/resource')
+        second = router.dispatch(
+            request, over=service['second'], path='/resource')
+        # Unreachable endpoints of other middlewares are not merged
+        self.assertEqual(first.allow, {'GET', 'PUT'})
+        self.assertIsNone(first.lookup('POST'))
+        self.assertIs(second.lookup('POST'), service['second']['any'])
+
+    def test_dispatch_topology_change(self):
+        service = Service(middlewares=[Resource])
+        resource = service['resource']
+        table = service.dispatch(self.make_request(method='POST'),
+            over=resource, path='/resource')
+        self.assertIsNone(table.lookup('POST'))
+        resource.push(Endpoint(service, name='create', methods=['POST']))
+        table = service.dispatch(self.make_request(method='POST'),
+            over=resource, path='/resource')
+        # Routes are compiled again after push
+        self.assertIs(table.lookup('POST'), resource['create'])
+
+
+class RouterWarmTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.snapshot = os.path.join(directory.name, 'routes.json')
+
+    # Helpers
+
+    def make_router(self, prefix='/items'):
+        service = Service(middlewares=[Items.config(prefix=prefix)])
+        router = component.Router(service, snapshot=self.snapshot)
+        return (router, service['items']['read'])
+
+    def read_snapshot(self):
+        with open(self.snapshot) as file:
+            return json.load(file)
+
+    def make_request(self, path):
+        return SimpleNamespace(method='GET', path=path)
+
+    # Tests
+
+    def test_warm(self):
+        router, endpoint = self.make_router()
+        router.warm()
+        snapshot = self.read_snapshot()
+        self.assertEqual(snapshot, router.dump())
+        self.assertEqual(
+            [item[0] for item in snapshot['patterns']],
+            ['/items/<key:int>', '/items/<key:int>/<name>'])
+        self.assertEqual(snapshot['patterns'][0][2:4],
+            [{'key': 'int'}, '/items/{key}'])
+
+    def test_warm_snapshot_loaded(self):
+        self.make_router()[0].warm()
+        router, endpoint = self.make_router()
+        original = component.Pattern.create
+        with patch.object(component.Pattern, 'create',
+                          side_effect=original) as create:
+            router.warm()
+        paths = [call[0][0] for call in create.call_args_list]
+        self.assertFalse([path for path in paths if '<' in path])
+        request = self.make_request('/items/1')
+        self.assertEqual(
+            router.match(request, path=endpoint.path), {'key': 1})
+
+    def test_warm_snapshot_outdated(self):
+        self.make_router()[0].warm()
+        key = self.read_snapshot()['key']
+        router, endpoint = self.make_router(prefix='/goods')
+        self.assertFalse(router.load(self.read_snapshot()))
+        router.warm()
+        self.assertNotEqual(self.read_snapshot()['key'], key)
+        request = self.make_request('/goods/1/name')
+        self.assertEqual(router.match(request, root='/goods/<key:int>'),
+            {'key': 1})
+
+
+    def test_warm_snapshot_broken(self):
+        key = self.make_router()[0].dump()['key']
+        for snapshot in [[], {}, {'key': key},
+                         {'key': key, 'patterns': [[1, 2, 3, 4, 5]]}]:
+            with open(self.snapshot, 'w') as file:
+                json.dump(snapshot, file)
+            router, endpoint = self.make_router()
+            router.warm()
+            # Broken snapshot is replaced
+            self.assertEqual(self.read_snapshot(), router.dump())
+            request = self.make_request('/items/1')
+            self.assertEqual(
+                router.match(request, path=endpoint.path), {'key': 1})
+
+
+class Items(Middleware):
+
+    # Public
+
+    @http.get('/<key:int>')
+    def read(self, request, key):
+        return http.Response()
+
+    @http.get('/<key:int>/<name>')
+    def part(self, request, key, name):
+        return http.Response()
+
+
+class Mixed(Middleware):
+
+    # Public
+
+    @http.get('/items/<key:int>')
+    def item(self, request, key):
+        return http.Response()
+
+    @http.get('/items/<key:int>/<name>')
+    def part(self, request, key, name):
+        return http.Response()
+
+    @http.get('/users/<key:int>')
+    def user(self, request, key):
+        return http.Response()
+
+
+class Resource(Middleware):
+
+    # Public
+
+    PREFIX = '/resource'
+
+    @http.get
+    @http.put
+    def update(self, request):
+        return http.Response()
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+component = import_module('interest.router.table')
+
+
+class TableTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.put = Mock(methods=['put'])
+        self.post = Mock(methods=['POST'])
+        self.any = Mock(methods=[])
+        self.table = component.Table()
+        self.table.add(self.put)
+        self.table.add(self.post)
+
+    # Tests
+
+    def test_allow(self):
+        self.assertEqual(self.table.allow, frozenset(['PUT', 'POST']))
+
+    def test_lookup(self):
+        self.assertEqual(self.table.lookup('PUT'), self.put)
+        self.assertEqual(self.table.lookup('POST'), self.post)
+        self.assertIsNone(self.table.lookup('GET'))
+
+    def test_lookup_after(self):
+        self.assertEqual(self.table.lookup('POST', after=self.put), self.post)
+        self.assertIsNone(self.table.lookup('PUT', after=self.put))
+
+    def test_lookup_any(self):
+        self.table.add(self.any)
+        self.assertEqual(self.table.lookup('GET'), self.any)
+        self.assertEqual(self.table.lookup('PUT'), self.put)
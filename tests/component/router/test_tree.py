@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+component = import_module('interest.router.tree')
+
+
+class TreeTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.tree = component.Tree()
+        for path, prefix in self.paths:
+            self.tree.add(path, Mock(prefix=prefix))
+
+    # Helpers
+
+    paths = [
+        # Path, prefix
+        ['', ''],
+        ['/api', '/api'],
+        ['/api/v1', '/api/v1'],
+        ['/api/v2', '/api/v2'],
+        ['/api/v1/comment', '/api/v1/comment'],
+        ['/api/v1/comment/key=<key:int>', '/api/v1/comment/key='],
+        ['/<key:path>', '/'],
+    ]
+
+    fixtures = [
+        # String, paths
+        ['/', {'', '/<key:path>'}],
+        ['/api', {'', '/api', '/<key:path>'}],
+        ['/api/v1/comment/key=1',
+         {'', '/api', '/api/v1', '/api/v1/comment',
+          '/api/v1/comment/key=<key:int>', '/<key:path>'}],
+        ['/api/v2/comment', {'', '/api', '/api/v2', '/<key:path>'}],
+        ['/ap', {'', '/<key:path>'}],
+        ['other', {''}],
+    ]
+
+    # Tests
+
+    def test_lookup(self):
+        for string, paths in self.fixtures:
+            self.assertEqual(self.tree.lookup(string), paths, string)
+
+    def test_contains(self):
+        self.assertIn('/api/v1', self.tree)
+        self.assertNotIn('/api/v3', self.tree)
+
+    def test_len(self):
+        self.tree.add('/api', Mock(prefix='/api'))
+        self.assertEqual(len(self.tree), len(self.paths))
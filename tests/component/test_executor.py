@@ -0,0 +1,143 @@
+import os
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+from importlib import import_module
+component = import_module('interest.executor')
+
+
+class ExecutorTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.service = Mock(loop=self.loop)
+        self.executor = component.Executor(
+            self.service, threads=2, processes=1, shared_length=10)
+        self.addCleanup(self.close)
+
+    # Helpers
+
+    def close(self):
+        self.loop.run_until_complete(self.executor.close())
+
+    # Tests
+
+    def test_threads(self):
+        self.assertEqual(self.executor.threads, 2)
+        self.assertEqual(self.executor.size('thread'), 2)
+
+    def test_processes(self):
+        self.assertEqual(self.executor.processes, 1)
+        self.assertEqual(self.executor.size('process'), 1)
+
+    def test_run(self):
+        function = lambda value, key: (
+            value, key, threading.current_thread().name)
+        value, key, thread = self.loop.run_until_complete(
+            self.executor.run(function, ['value'], {'key': 'key'}))
+        self.assertEqual((value, key), ('value', 'key'))
+        self.assertNotEqual(thread, threading.current_thread().name)
+        self.assertEqual(self.executor.pending(), 0)
+
+    def test_run_pending(self):
+        event = threading.Event()
+        tasks = [self.loop.create_task(self.executor.run(event.wait))
+                 for _ in range(3)]
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.assertEqual(self.executor.pending(), 3)
+        self.assertEqual(self.executor.queued(), 1)
+        event.set()
+        self.loop.run_until_complete(asyncio.gather(*tasks, loop=self.loop))
+        self.assertEqual(self.executor.pending(), 0)
+
+    def test_run_kind_kwarg(self):
+        function = lambda kind, function: (kind, function)
+        result = self.loop.run_until_complete(self.executor.run(
+            function, kwargs={'kind': 'kind', 'function': 'function'}))
+        self.assertEqual(result, ('kind', 'function'))
+
+    def test_run_kind_unsupported(self):
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(
+                self.executor.run(print, kind='unknown'))
+
+    def test_run_process(self):
+        value, pid = self.loop.run_until_complete(
+            self.executor.run(identify, ['value'], kind='process'))
+        self.assertEqual(value, 'value')
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(self.executor.pending('process'), 0)
+
+    def test_run_process_shared(self):
+        result = self.loop.run_until_complete(
+            self.executor.run(
+                repeat, [b'ab'], {'times': 10}, kind='process'))
+        self.assertEqual(result, b'ab' * 10)
+
+    def test_run_process_shared_cancelled(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        with patch.object(component.Segment, 'DIRECTORY', directory):
+            task = self.loop.create_task(self.executor.run(
+                delay, [b'ab'], {'times': 10}, kind='process'))
+            self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                self.loop.run_until_complete(task)
+            self.close()
+        # Check not read segment is removed
+        self.assertEqual(os.listdir(directory), [])
+
+    def test_run_process_local_function(self):
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(
+                self.executor.run(lambda: None, kind='process'))
+
+    def test_start(self):
+        self.executor.require('process')
+        self.executor.start()
+        self.assertEqual(self.loop.run_until_complete(
+            self.executor.run(repeat, [b'a'], {'times': 2}, kind='process')),
+            b'aa')
+
+    def test_require_kind_unsupported(self):
+        with self.assertRaises(ValueError):
+            self.executor.require('unknown')
+
+
+class SegmentTest(unittest.TestCase):
+
+    # Tests
+
+    def test_write_read(self):
+        segment = component.Segment.write(b'data')
+        self.assertEqual(segment.length, 4)
+        self.assertEqual(segment.read(), b'data')
+        self.assertFalse(os.path.exists(segment.path))
+
+    def test_release(self):
+        segment = component.Segment.write(b'data')
+        segment.release()
+        segment.release()
+        self.assertFalse(os.path.exists(segment.path))
+
+
+# Helpers
+
+def identify(value):
+    return (value, os.getpid())
+
+
+def repeat(value, times):
+    return value * times
+
+
+def delay(value, times):
+    time.sleep(0.1)
+    return value * times
@@ -25,3 +25,14 @@ class MiddlewareTest(unittest.TestCase):
 
     def test_service(self):
         self.assertEqual(self.middleware.service, self.service)
+
+    def test_path(self):
+        parent = self.Middleware(self.service, prefix='/parent')
+        child = self.Middleware(self.service, prefix='/child')
+        parent.push(child)
+        self.assertEqual(child.path, '/parent/child')
+        # Path is updated on topology change
+        top = self.Middleware(self.service, prefix='/top')
+        top.push(parent)
+        self.assertEqual(parent.path, '/top/parent')
+        self.assertEqual(child.path, '/top/parent/child')
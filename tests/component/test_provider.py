@@ -0,0 +1,36 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+from importlib import import_module
+component = import_module('interest.provider')
+
+
+class ProviderTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.service = Mock(loop=self.loop)
+
+    # Tests
+
+    def test(self):
+        provider = component.Provider(self.service)
+        self.assertEqual(provider.service, self.service)
+        self.assertEqual(provider.name, 'provider')
+        self.assertEqual(provider.depends, [])
+        self.assertIsNone(provider.duration)
+
+    def test___call__(self):
+        provide = asyncio.coroutine(lambda service: 'value')
+        provider = component.Provider(self.service, provide=provide)
+        self.assertEqual(
+            self.loop.run_until_complete(provider(self.service)), 'value')
+        self.assertGreaterEqual(provider.duration, 0)
+
+    def test_close(self):
+        provider = component.Provider(self.service)
+        self.assertIsNone(
+            self.loop.run_until_complete(provider.close(self.service)))
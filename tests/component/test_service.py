@@ -1,7 +1,8 @@
 import asyncio
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from importlib import import_module
+from interest import Provider
 component = import_module('interest.service')
 
 
@@ -13,12 +14,21 @@ class ServiceTest(unittest.TestCase):
         self.loop = Mock()
         self.logger = Mock()
         self.handler = Mock()
+        self.metrics = Mock()
+        self.executor = Mock()
+        self.supervisor = Mock()
         self.Logger = Mock(return_value=self.logger)
         self.Handler = Mock(return_value=self.handler)
+        self.Metrics = Mock(return_value=self.metrics)
+        self.Executor = Mock(return_value=self.executor)
+        self.Supervisor = Mock(return_value=self.supervisor)
         self.service = component.Service(
             loop=self.loop,
             logger=self.Logger,
-            handler=self.Handler)
+            handler=self.Handler,
+            metrics=self.Metrics,
+            executor=self.Executor,
+            supervisor=self.Supervisor)
 
     # Tests
 
@@ -26,23 +36,209 @@ class ServiceTest(unittest.TestCase):
         # Check class calls
         self.Logger.assert_called_with(self.service)
         self.Handler.assert_called_with(self.service)
+        self.Metrics.assert_called_with(self.service)
+        self.assertEqual(self.service.metrics, self.metrics)
+        self.Executor.assert_called_with(self.service)
+        self.assertEqual(self.service.executor, self.executor)
+        self.Supervisor.assert_called_with(self.service)
 
     def test_listen(self):
         self.service.listen(host='host', port='port', forever=True)
         # Check loop calls
         self.loop.create_server.assert_called_with(
             self.handler.fork, 'host', 'port')
-        self.loop.run_until_complete.assert_called_with(
+        self.loop.run_until_complete.assert_any_call(
             self.loop.create_server.return_value)
         self.loop.run_forever.assert_called_with()
+        self.assertEqual(self.loop.run_until_complete.call_count, 2)
+
+    def test_listen_warm_mounted(self):
+        router = Mock()
+        service = component.Service(
+            loop=Mock(), logger=Mock(), router=Mock(return_value=router))
+        self.service.push(service)
+        self.service.listen(host='host', port='port')
+        # Mounted service's routes are compiled before listening
+        router.warm.assert_called_with()
 
     def test_listen_keyboard_interrupt(self):
         self.loop.run_forever.side_effect = KeyboardInterrupt()
         self.service.listen(host='host', port='port', forever=True)
 
+    @patch.object(component, 'socket')
+    def test_listen_workers(self, socket):
+        socket.getaddrinfo.return_value = [
+            ('family', 'type', 'proto', '', 'address')]
+        self.service.listen(host='host', port='port', workers=2)
+        # Check socket and supervisor calls
+        socket.socket.return_value.bind.assert_called_with('address')
+        self.assertEqual(
+            self.supervisor.run.call_args[1], {'workers': 2})
+        self.assertFalse(self.loop.create_server.called)
+
+    def test_shutdown(self):
+        self.handler.shutdown = asyncio.coroutine(lambda timeout: (1, 2))
+        close = Mock()
+        self.executor.close = asyncio.coroutine(close)
+        self.service.listen(host='host', port='port')
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.assertEqual(
+            loop.run_until_complete(self.service.shutdown()), (1, 2))
+        # Check server and executor are closed
+        self.loop.run_until_complete.return_value.close.assert_called_with()
+        close.assert_called_with()
+
+    def test_shutdown_mounted_executor(self):
+        self.handler.shutdown = asyncio.coroutine(lambda timeout: (1, 2))
+        self.executor.close = asyncio.coroutine(Mock())
+        executor = Mock()
+        close = Mock()
+        executor.close = asyncio.coroutine(close)
+        service = component.Service(loop=Mock(), logger=Mock(),
+            executor=Mock(return_value=executor))
+        self.service.push(service)
+        self.service.listen(host='host', port='port')
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        loop.run_until_complete(self.service.shutdown())
+        # Check mounted service's executor is started and closed
+        executor.start.assert_called_with()
+        close.assert_called_with()
+
     def test_loop(self):
         self.assertEqual(self.service.loop, self.loop)
 
     def test_loop_default(self):
         self.service = component.Service()
         self.assertEqual(self.service.loop, asyncio.get_event_loop())
+
+    def test_metrics_mounted(self):
+        service = component.Service(loop=Mock(), logger=Mock())
+        self.service.push(service)
+        # Mounted service records to the main service's metrics
+        self.assertIs(service.metrics, self.metrics)
+
+    def test_loop_mounted(self):
+        service = component.Service(loop=Mock())
+        self.service.push(service)
+        # Mounted service uses the main service's loop
+        self.assertEqual(service.loop, self.loop)
+
+
+class ServiceProvidersTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.events = []
+
+    def make_provider(self, name, depends=[], delay=0):
+        @asyncio.coroutine
+        def provide(service):
+            self.events.append(('start', name))
+            yield from asyncio.sleep(delay, loop=self.loop)
+            self.events.append(('provide', name))
+        @asyncio.coroutine
+        def close(service):
+            self.events.append(('close', name))
+        return Provider.config(
+            name=name, depends=depends, provide=provide, close=close)
+
+    def make_service(self, providers):
+        return component.Service(
+            loop=self.loop, logger=Mock(), providers=providers)
+
+    # Tests
+
+    def test_providers(self):
+        service = self.make_service([
+            self.make_provider('cache', depends=['database']),
+            self.make_provider('database', delay=0.01),
+            self.make_provider('queue')])
+        # Independent providers are started concurrently
+        self.assertEqual(self.events[:2], [
+            ('start', 'database'), ('start', 'queue')])
+        self.assertLess(
+            self.events.index(('provide', 'database')),
+            self.events.index(('start', 'cache')))
+        self.events.clear()
+        self.loop.run_until_complete(service.shutdown())
+        self.assertEqual(self.events, [
+            ('close', 'cache'), ('close', 'database'), ('close', 'queue')])
+
+    def test_providers_unknown_dependency(self):
+        with self.assertRaises(ValueError):
+            self.make_service([self.make_provider('cache', depends=['db'])])
+
+    def test_providers_cyclic_dependency(self):
+        with self.assertRaises(ValueError):
+            self.make_service([
+                self.make_provider('cache', depends=['database']),
+                self.make_provider('database', depends=['cache'])])
+
+    def test_providers_duplicate(self):
+        with self.assertRaises(ValueError):
+            self.make_service([
+                self.make_provider('cache'), self.make_provider('cache'),
+                self.make_provider('queue', depends=['cache'])])
+
+    def test_providers_duplicate_not_referenced(self):
+        self.make_service([
+            self.make_provider('cache'), self.make_provider('cache')])
+        self.assertEqual(self.events, [
+            ('start', 'cache'), ('start', 'cache'),
+            ('provide', 'cache'), ('provide', 'cache')])
+
+    def test_providers_unnamed(self):
+        @asyncio.coroutine
+        def provide(service):
+            self.events.append('provide')
+        self.make_service([
+            Provider.config(provide=provide),
+            Provider.config(provide=provide)])
+        # Both are named provider but started
+        self.assertEqual(self.events, ['provide', 'provide'])
+
+    def test_providers_mounted_shutdown(self):
+        mounted = self.make_service([self.make_provider('database')])
+        service = self.make_service([self.make_provider('cache')])
+        service.push(mounted)
+        self.events.clear()
+        self.loop.run_until_complete(service.shutdown())
+        # Mounted service's providers are closed after the main ones
+        self.assertEqual(self.events, [
+            ('close', 'cache'), ('close', 'database')])
+
+    def test_providers_mounted_worker(self):
+        mounted = self.make_service([self.make_provider('database')])
+        service = self.make_service([self.make_provider('cache')])
+        service.push(mounted)
+        self.events.clear()
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        loop.create_server = asyncio.coroutine(Mock())
+        # Worker stops as soon as it starts listening
+        loop.add_signal_handler = Mock(
+            side_effect=lambda signum, callback: loop.call_soon(loop.stop))
+        with patch.object(component.asyncio, 'new_event_loop',
+                          return_value=loop), \
+                patch.object(component.asyncio, 'set_event_loop'):
+            service._Service__listen_worker('host', 'port', None, {})
+        # Mounted service's providers are applied on the worker's loop
+        self.assertIs(mounted.loop, loop)
+        self.assertEqual(self.events[:4], [
+            ('start', 'database'), ('provide', 'database'),
+            ('start', 'cache'), ('provide', 'cache')])
+
+    def test_providers_failure(self):
+        @asyncio.coroutine
+        def provide(service):
+            raise RuntimeError()
+        with self.assertRaises(RuntimeError):
+            self.make_service([
+                self.make_provider('cache', depends=['database']),
+                Provider.config(name='database', provide=provide)])
+        self.assertEqual(self.events, [])
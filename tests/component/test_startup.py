@@ -0,0 +1,46 @@
+import io
+import unittest
+from importlib import import_module
+component = import_module('interest.startup')
+
+
+class StartupTest(unittest.TestCase):
+
+    # Tests
+
+    def test_profile(self):
+        results = component.profile(['Router', 'Parser'])
+        self.assertEqual(
+            [name for name, _, _ in results],
+            ['interest', 'Router', 'Parser'])
+        for _, duration, modules in results:
+            self.assertGreaterEqual(duration, 0)
+            self.assertIsInstance(modules, list)
+
+    def test_report(self):
+        file = io.StringIO()
+        component.report([('Router', 0.002, ['interest.router'])], file=file)
+        lines = file.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('Router'))
+        self.assertIn('2.00 ms', lines[0])
+        self.assertTrue(lines[1].startswith('total'))
+
+
+class PackageTest(unittest.TestCase):
+
+    # Tests
+
+    def test_attributes(self):
+        package = import_module('interest')
+        from interest.router import Router
+        self.assertIs(package.Router, Router)
+        self.assertIn('Service', dir(package))
+
+    def test_attributes_private(self):
+        package = import_module('interest')
+        self.assertNotIn('MODULES', dir(package))
+
+    def test_attribute_unknown(self):
+        package = import_module('interest')
+        with self.assertRaises(AttributeError):
+            package.Unknown
@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import Mock, call, patch
+from importlib import import_module
+component = import_module('interest.supervisor')
+
+
+class SupervisorTest(unittest.TestCase):
+
+    # Actions
+
+    def setUp(self):
+        self.addCleanup(patch.stopall)
+        self.os = patch.object(component, 'os').start()
+        self.signal = patch.object(component, 'signal').start()
+        self.time = patch.object(component, 'time').start()
+        self.time.monotonic.return_value = 0
+        self.threading = patch.object(component, 'threading').start()
+        self.stopped = self.threading.Event.return_value
+        self.service = Mock()
+        self.supervisor = component.Supervisor(self.service)
+
+    # Tests
+
+    def test_service(self):
+        self.assertEqual(self.supervisor.service, self.service)
+
+    def test_run(self):
+        self.os.fork.side_effect = [1, 2]
+        self.os.wait.side_effect = [
+            (1, 0), ChildProcessError()]
+        self.supervisor.run(Mock(), workers=1)
+        # Crashed worker is forked again
+        self.assertEqual(self.os.fork.call_count, 2)
+        self.assertEqual(self.supervisor.pids, {2})
+
+    def test_run_worker(self):
+        worker = Mock()
+        self.os.fork.return_value = 0
+        self.os.wait.side_effect = ChildProcessError()
+        self.supervisor.run(worker, workers=1)
+        # Check worker process
+        worker.assert_called_with()
+        self.os._exit.assert_called_with(0)
+
+    def test_run_worker_with_error(self):
+        worker = Mock(side_effect=RuntimeError())
+        self.os.fork.return_value = 0
+        self.os.wait.side_effect = ChildProcessError()
+        self.supervisor.run(worker, workers=1)
+        self.os._exit.assert_called_with(1)
+
+    def test_stop(self):
+        def wait():
+            handle_stop = self.signal.signal.call_args_list[0][0][1]
+            handle_stop(self.signal.SIGTERM, None)
+            return (1, 0)
+        self.os.fork.return_value = 1
+        self.os.wait.side_effect = wait
+        self.supervisor.run(Mock(), workers=1)
+        # Check workers are stopped and not forked again
+        self.os.kill.assert_called_with(1, self.signal.SIGTERM)
+        self.signal.setitimer.assert_any_call(
+            self.signal.ITIMER_REAL, self.supervisor.SHUTDOWN_TIMEOUT)
+        self.assertEqual(self.os.fork.call_count, 1)
+
+    def test_run_restart_delay(self):
+        self.os.fork.side_effect = [1, 2, 3]
+        self.os.wait.side_effect = [
+            (1, 256), (2, 256), ChildProcessError()]
+        self.supervisor.run(Mock(), workers=1)
+        # Quick failures are forked again with a growing delay
+        self.assertEqual(
+            self.stopped.wait.call_args_list, [call(0.1), call(0.2)])
+        self.assertEqual(self.supervisor.pids, {3})
+
+    def test_run_restart_delay_reset(self):
+        self.time.monotonic.side_effect = [0, 5, 20, 30, 30]
+        self.os.fork.side_effect = [1, 2, 3]
+        self.os.wait.side_effect = [
+            (1, 256), (2, 256), ChildProcessError()]
+        self.supervisor.run(Mock(), workers=1)
+        # Long running worker is forked again at once
+        self.assertEqual(self.stopped.wait.call_args_list, [call(0.1)])
+
+    def test_run_max_failures(self):
+        self.supervisor = component.Supervisor(
+            self.service, max_failures=2)
+        self.os.fork.side_effect = [1, 2, 3, 4]
+        self.os.wait.side_effect = [(1, 256), (2, 256), (3, 256)]
+        self.supervisor.run(Mock(), workers=1)
+        # Supervisor gives up and doesn't fork anymore
+        self.assertEqual(self.os.fork.call_count, 3)
+        self.assertEqual(self.supervisor.pids, set())
+
+    def test_stop_restart_delay(self):
+        def wait(delay):
+            handle_stop = self.signal.signal.call_args_list[0][0][1]
+            handle_stop(self.signal.SIGTERM, None)
+        self.stopped.wait.side_effect = wait
+        self.os.fork.side_effect = [1, 2]
+        self.os.wait.side_effect = [(1, 256), ChildProcessError()]
+        self.supervisor.run(Mock(), workers=1)
+        # Stop during restart delay wakes waiting up
+        self.stopped.set.assert_called_with()
+        self.assertEqual(self.os.fork.call_count, 1)
+
+    def test_reload(self):
+        def wait():
+            if self.os.wait.call_count == 1:
+                handle_reload = self.signal.signal.call_args_list[2][0][1]
+                handle_reload(self.signal.SIGHUP, None)
+                return (1, 0)
+            raise ChildProcessError()
+        self.os.fork.side_effect = [1, 2]
+        self.os.wait.side_effect = wait
+        self.supervisor.run(Mock(), workers=1)
+        # Reloaded worker is forked again without delay
+        self.os.kill.assert_called_with(1, self.signal.SIGHUP)
+        self.assertFalse(self.stopped.wait.called)
+        self.assertEqual(self.supervisor.pids, {2})